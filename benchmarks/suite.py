@@ -0,0 +1,287 @@
+"""
+Benchmark suite for the hot paths of both apps, with stored baselines.
+
+Every case is timed a few times and its best rate (operations per second)
+is kept. Results are written as JSON along with the commit they were
+measured at, and compared with a baseline file: a case whose rate drops
+more than the threshold below its baseline is a regression, and the run
+exits with status 1.
+
+The GUI cases need a display. Without one they run under Xvfb, if that is
+installed, and are reported as skipped otherwise.
+
+Usage:
+    python benchmarks/suite.py                          # compare with baseline.json
+    python benchmarks/suite.py --json results.json      # also save the results
+    python benchmarks/suite.py --save-baseline          # make these the baseline
+    python benchmarks/suite.py --compare old.json new.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'rock_paper_scissors'), os.path.join(ROOT, 'calculator')]
+
+from bench_calc import _formulas  # noqa: E402
+from rules import CLASSIC  # noqa: E402
+import evaluator  # noqa: E402
+import script  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.25
+REPEAT = 5
+
+
+class Skip(Exception):
+    """A case that cannot run in this environment"""
+
+
+def _pairs(rounds, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice(CLASSIC.moves), rng.choice(CLASSIC.moves)) for _ in range(rounds)]
+
+
+# Each case returns (operations, seconds) for one timed run
+
+def case_script_determine_winner(rounds=200_000):
+    pairs = _pairs(rounds)
+    determine_winner = script.determine_winner
+    start = time.perf_counter()
+    for player, computer in pairs:
+        determine_winner(player, computer)
+    return rounds, time.perf_counter() - start
+
+
+def case_script_get_computer_choice(rounds=200_000):
+    get_computer_choice = script.get_computer_choice
+    start = time.perf_counter()
+    for _ in range(rounds):
+        get_computer_choice()
+    return rounds, time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def virtual_display():
+    """Use the current display, or run an Xvfb server for the duration"""
+    if os.environ.get('DISPLAY'):
+        yield
+        return
+    if shutil.which('Xvfb') is None:
+        raise Skip("no display and Xvfb is not installed")
+    display = f":{100 + os.getpid() % 500}"
+    server = subprocess.Popen(['Xvfb', display, '-screen', '0', '1024x768x24', '-nolisten', 'tcp'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    try:
+        time.sleep(0.5)  # let the server start accepting clients
+        yield
+    finally:
+        del os.environ['DISPLAY']
+        server.terminate()
+        server.wait()
+
+
+def _gui():
+    import tkinter as tk
+    from rps_gui import RockPaperScissorsGUI
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise Skip(f"cannot open a window: {e}") from None
+    root.withdraw()
+    return root, RockPaperScissorsGUI(root)
+
+
+def case_gui_determine_winner(rounds=200_000):
+    with virtual_display():
+        root, game = _gui()
+        try:
+            pairs = _pairs(rounds)
+            determine_winner = game.determine_winner
+            start = time.perf_counter()
+            for player, computer in pairs:
+                determine_winner(player, computer)
+            return rounds, time.perf_counter() - start
+        finally:
+            root.destroy()
+
+
+def case_gui_play_game(rounds=20_000, redraw_every=100):
+    """play_game with the window's idle redraws processed as it would in mainloop"""
+    with virtual_display():
+        root, game = _gui()
+        try:
+            moves = [player for player, _ in _pairs(rounds)]
+            start = time.perf_counter()
+            for i, move in enumerate(moves):
+                game.play_game(move)
+                if i % redraw_every == 0:
+                    root.update_idletasks()
+            root.update_idletasks()
+            return rounds, time.perf_counter() - start
+        finally:
+            root.destroy()
+
+
+def _safe_eval_rate(exprs, cold):
+    safe_eval = evaluator.safe_eval
+    clear = evaluator.compile_cached.cache_clear
+    clear()
+    start = time.perf_counter()
+    for expr in exprs:
+        if cold:
+            clear()
+        try:
+            safe_eval(expr, 100_000)
+        except ArithmeticError:
+            pass
+    return len(exprs), time.perf_counter() - start
+
+
+def case_safe_eval_short_cold():
+    return _safe_eval_rate(_formulas(5_000), cold=True)
+
+
+def case_safe_eval_short_cached():
+    return _safe_eval_rate(_formulas(100) * 500, cold=False)
+
+
+def case_safe_eval_long():
+    """10,000-term formulas"""
+    return _safe_eval_rate(['+'.join(_formulas(2_000, seed)) for seed in range(5)], cold=True)
+
+
+def case_safe_eval_pathological():
+    """Deep nesting, long sign runs and powers rejected by the size budget"""
+    exprs = ['(' * 20_000 + '1' + ')' * 20_000, '-' * 20_000 + '1', '9**9**9', '2**2**2**2**2**2',
+             '1' * 4_000 + '*' + '1' * 4_000]
+    return _safe_eval_rate(exprs * 4, cold=True)
+
+
+CASES = {
+    'rps.script.determine_winner': case_script_determine_winner,
+    'rps.script.get_computer_choice': case_script_get_computer_choice,
+    'rps.gui.determine_winner': case_gui_determine_winner,
+    'rps.gui.play_game': case_gui_play_game,
+    'calc.safe_eval.short_cold': case_safe_eval_short_cold,
+    'calc.safe_eval.short_cached': case_safe_eval_short_cached,
+    'calc.safe_eval.long': case_safe_eval_long,
+    'calc.safe_eval.pathological': case_safe_eval_pathological,
+}
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(pattern=None, repeat=REPEAT):
+    """Run the cases whose names match pattern; return the results document"""
+    results = {}
+    skipped = {}
+    for name, case in CASES.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        try:
+            best = max(operations / seconds for operations, seconds in (case() for _ in range(repeat)))
+        except Skip as e:
+            skipped[name] = str(e)
+            continue
+        results[name] = {'rate': best, 'unit': 'ops/s'}
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """(name, baseline rate, current rate, change) for the cases in both
+    documents, the names of those that regressed beyond threshold, and the
+    names of the cases that ran but have no baseline to compare with"""
+    rows = []
+    regressions = []
+    unbaselined = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            unbaselined.append(name)
+            continue
+        before = baseline['results'][name]['rate']
+        change = result['rate'] / before - 1
+        rows.append((name, before, result['rate'], change))
+        if change < -threshold:
+            regressions.append(name)
+    return rows, regressions, unbaselined
+
+
+def report(document, rows, regressions, unbaselined=(), out=sys.stdout):
+    for name, result in document['results'].items():
+        out.write(f"{name:<32} {result['rate']:>14,.0f} ops/s\n")
+    for name, reason in document['skipped'].items():
+        out.write(f"{name:<32} skipped: {reason}\n")
+    if rows:
+        out.write("\nchange against baseline:\n")
+        for name, before, after, change in rows:
+            flag = "  REGRESSION" if name in regressions else ""
+            out.write(f"{name:<32} {before:>14,.0f} -> {after:>14,.0f} ({change:+.1%}){flag}\n")
+    if unbaselined:
+        out.write("\nnot compared, no baseline entry (record one with --save-baseline):\n")
+        for name in unbaselined:
+            out.write(f"{name}\n")
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark both apps and compare with a baseline.")
+    parser.add_argument('--baseline', default=BASELINE,
+                        help="results to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown counted as a regression, as a fraction (default: 0.25)")
+    parser.add_argument('--json', metavar='PATH', help="write the results to PATH")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="write the results to the baseline file")
+    parser.add_argument('--only', metavar='REGEX', help="run only the matching cases")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed runs per case; the best counts")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="compare two saved results instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, document = map(_load, args.compare)
+    else:
+        document = run(args.only, args.repeat)
+        baseline = _load(args.baseline) if os.path.exists(args.baseline) else None
+        for path in [args.json, args.baseline if args.save_baseline else None]:
+            if path:
+                with open(path, 'w') as f:
+                    json.dump(document, f, indent=2)
+                    f.write('\n')
+        if args.save_baseline:
+            baseline = None
+    rows, regressions, unbaselined = compare(baseline, document, args.threshold) if baseline else ([], [], [])
+    report(document, rows, regressions, unbaselined)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
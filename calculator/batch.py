@@ -0,0 +1,182 @@
+"""
+Evaluate a file of expressions, one per line, on all cores.
+
+Lines are read chunk_size at a time and each chunk's distinct expressions
+are evaluated by a pool of worker processes, with a bounded number of chunks
+in flight. Results are written in input order, one line per input line: the
+result, or an empty line for an expression that failed, with the error
+reported on stderr. Blank input lines give blank output lines.
+
+Expressions are deduplicated within a chunk, against those still being
+evaluated and against a bounded cache of recent results, so memory use does
+not depend on the size of the input.
+
+Usage:
+    python -m batch expressions.txt > results.txt
+"""
+import argparse
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from display import MODES
+from worker import MAX_RESULT_BITS, evaluate
+
+DEFAULT_CHUNK_SIZE = 10_000
+# Results of this many distinct recent expressions are kept for reuse
+DEFAULT_CACHE_SIZE = 100_000
+
+
+def evaluate_chunk(exprs, max_bits=MAX_RESULT_BITS, mode='scaled'):
+    """worker.evaluate for each expression"""
+    return [evaluate(expr, max_bits, mode) for expr in exprs]
+
+
+class _Chunk:
+    """One chunk's lines and the evaluation of its new expressions"""
+
+    __slots__ = ('first_line', 'keys', 'exprs', 'borrowed', 'future')
+
+    def __init__(self, first_line, keys):
+        self.first_line = first_line
+        self.keys = keys      # per line: the expression, or None for a blank line
+        self.exprs = {}       # new expression -> index into this chunk's results
+        self.borrowed = {}    # other expression -> cached result, or the chunk evaluating it
+        self.future = None
+
+    def result(self, expr):
+        if expr in self.exprs:
+            return self.future.result()[self.exprs[expr]]
+        source = self.borrowed[expr]
+        # Chunks are written in order, so an earlier chunk's future is done
+        return source.result(expr) if isinstance(source, _Chunk) else source
+
+
+def run_batch(stream, out, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              max_bits=MAX_RESULT_BITS, cache_size=DEFAULT_CACHE_SIZE, err=sys.stderr,
+              mode='scaled'):
+    """Evaluate every line of stream and write the results to out
+
+    Results are written in the given display mode (see display.py).
+    workers=1 evaluates in this process. Returns the (lines, errors) counts.
+    """
+    executor = None if workers == 1 else ProcessPoolExecutor(max_workers=workers)
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    cache = OrderedDict()  # expression -> (ok, text), least recently used first
+    in_flight = {}         # expression -> chunk evaluating it
+    chunks = deque()
+    counts = [0, 0]
+
+    def submit(chunk):
+        exprs = list(chunk.exprs)
+        if executor is None:
+            chunk.future = Future()
+            chunk.future.set_result(evaluate_chunk(exprs, max_bits, mode))
+        else:
+            chunk.future = executor.submit(evaluate_chunk, exprs, max_bits, mode)
+        for expr in exprs:
+            in_flight[expr] = chunk
+        chunks.append(chunk)
+
+    def write_oldest():
+        chunk = chunks.popleft()
+        results = chunk.future.result()
+        lines = []
+        for offset, key in enumerate(chunk.keys):
+            if key is None:
+                lines.append('\n')
+                continue
+            ok, text = chunk.result(key)
+            if ok:
+                lines.append(text + '\n')
+            else:
+                lines.append('\n')
+                counts[1] += 1
+                err.write(f"line {chunk.first_line + offset}: {text}\n")
+        out.write(''.join(lines))
+        # Later chunks may still borrow this one's results, but nothing else
+        chunk.keys = chunk.borrowed = None
+        for expr, index in chunk.exprs.items():
+            if in_flight.get(expr) is chunk:
+                del in_flight[expr]
+            cache[expr] = results[index]
+        while len(cache) > cache_size:
+            cache.popitem(last=False)
+
+    def read_chunk(first_line, keys):
+        chunk = _Chunk(first_line, keys)
+        for key in keys:
+            if key is None or key in chunk.exprs or key in chunk.borrowed:
+                continue
+            if key in cache:
+                chunk.borrowed[key] = cache[key]
+                cache.move_to_end(key)
+            elif key in in_flight:
+                chunk.borrowed[key] = in_flight[key]
+            else:
+                chunk.exprs[key] = len(chunk.exprs)
+        submit(chunk)
+        if len(chunks) >= max_in_flight:
+            write_oldest()
+
+    try:
+        keys = []
+        first_line = 1
+        for line in stream:
+            # Spaces, tabs and form feeds at the end of a line never change
+            # its meaning, so they do not split the cache
+            expr = line.rstrip(' \t\f\r\n')
+            keys.append(expr if expr else None)
+            if len(keys) == chunk_size:
+                read_chunk(first_line, keys)
+                first_line += len(keys)
+                keys = []
+        if keys:
+            read_chunk(first_line, keys)
+        while chunks:
+            write_oldest()
+        counts[0] = first_line - 1 + len(keys)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return tuple(counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate arithmetic expressions, one per line.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="file of expressions (default: stdin)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="file for the results (default: stdout)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="lines sent to a worker at a time")
+    parser.add_argument('--max-bits', type=int, default=MAX_RESULT_BITS,
+                        help="size budget of integer results, in bits")
+    parser.add_argument('--format', choices=MODES, default='scaled',
+                        help="scaled: huge integers in scientific notation (default); "
+                             "decimal or fraction: exact values")
+    args = parser.parse_args(argv)
+
+    stream = sys.stdin if args.input == '-' else open(args.input)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    try:
+        lines, errors = run_batch(stream, out, args.workers, args.chunk_size, args.max_bits,
+                                  mode=args.format)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    sys.stderr.write(f"{lines:,} lines, {errors:,} errors in {elapsed:.2f}s "
+                     f"({lines / max(elapsed, 1e-9):,.0f} lines/s)\n")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Throughput benchmarks for the calculator's expression evaluation.
+
+Usage:
+    python bench_calc.py
+"""
+import random
+import time
+
+import evaluator
+from display import format_result
+from evaluator import compile_cached, eval_cache_info, safe_eval
+
+
+def _formulas(count, seed=0):
+    rng = random.Random(seed)
+    formulas = []
+    for _ in range(count):
+        expr = str(rng.randint(1, 999))
+        operator = None
+        for _ in range(rng.randint(1, 7)):
+            # Keep powers small and unchained, as in real formulas
+            operator = rng.choice(['+', '-', '*', '/', '%'] + (['**'] if operator != '**' else []))
+            term = str(rng.randint(1, 3) if operator == '**' else rng.randint(1, 999))
+            expr += f" {operator} {'(' + term + ')' if rng.random() < 0.2 else term}"
+        formulas.append(expr)
+    return formulas
+
+
+def repeated_workload(evaluations=200_000, distinct=500, seed=0):
+    """A stream of formulas where a few are evaluated far more often than the
+    rest, like the same spreadsheet formulas recomputed over and over"""
+    rng = random.Random(seed)
+    formulas = _formulas(distinct, seed)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(formulas, weights, k=evaluations)
+
+
+def _evaluate(expr):
+    try:
+        return safe_eval(expr)
+    except ArithmeticError:
+        return None
+
+
+def bench_safe_eval_cold(workload, evaluations=20_000):
+    """Evaluations per second when every expression has to be parsed"""
+    elapsed = 0
+    for expr in workload[:evaluations]:
+        compile_cached.cache_clear()
+        start = time.perf_counter()
+        _evaluate(expr)
+        elapsed += time.perf_counter() - start
+    return evaluations / elapsed
+
+
+def bench_safe_eval_cached(workload):
+    """Evaluations per second through the compiled-expression cache, and the
+    cache statistics afterwards"""
+    compile_cached.cache_clear()
+    start = time.perf_counter()
+    for expr in workload:
+        _evaluate(expr)
+    return len(workload) / (time.perf_counter() - start), eval_cache_info()
+
+
+def bench_compile(workload, compile_function, evaluations=20_000):
+    """Expressions compiled per second by one of the evaluator's front ends"""
+    start = time.perf_counter()
+    for expr in workload[:evaluations]:
+        compile_function(expr)
+    return evaluations / (time.perf_counter() - start)
+
+
+def bench_long_expressions(terms=100_000):
+    """Seconds to compile and run a long flat sum and a deeply nested one,
+    both far beyond what the recursive AST path could handle"""
+    timings = {}
+    for name, expr in [('chain', '+'.join(['1'] * terms)),
+                       ('nested', '(' * terms + '1' + ')' * terms)]:
+        start = time.perf_counter()
+        evaluator.run(evaluator.compile_expression(expr))
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def bench_format_result(bits=(1_000, 10_000, 100_000, 1_000_000), repeat=20):
+    """Seconds per display of a result of each size, scaled and as str()"""
+    timings = {}
+    for size in bits:
+        value = (1 << size) // 3
+        start = time.perf_counter()
+        for _ in range(repeat):
+            format_result(value)
+        scaled = (time.perf_counter() - start) / repeat
+        start = time.perf_counter()
+        try:
+            str(value)
+        except ValueError:  # beyond the int to str conversion limit
+            plain = None
+        else:
+            plain = time.perf_counter() - start
+        timings[size] = scaled, plain
+    return timings
+
+
+def main():
+    workload = repeated_workload()
+    cold = bench_safe_eval_cold(workload)
+    cached, info = bench_safe_eval_cached(workload)
+    print(f"safe_eval, parsing every time: {cold:>12,.0f} evals/s")
+    print(f"safe_eval, compiled cache:     {cached:>12,.0f} evals/s  ({cached / cold:.1f}x)")
+    print(f"cache: {info.hits:,} hits, {info.misses:,} misses")
+    tokens = bench_compile(workload, evaluator._compile_tokens)
+    tree = bench_compile(workload, evaluator._compile_ast)
+    print(f"compile, tokenizer:            {tokens:>12,.0f} exprs/s  ({tokens / tree:.1f}x the AST path)")
+    print(f"compile, AST path:             {tree:>12,.0f} exprs/s")
+    for name, seconds in bench_long_expressions().items():
+        print(f"100,000-term {name + ':':<17} {seconds:>12.3f} s")
+    for size, (scaled, plain) in bench_format_result().items():
+        plain = f"{plain * 1e3:.3f} ms" if plain is not None else "fails"
+        print(f"display {size:>9,}-bit result: {scaled * 1e3:>8.3f} ms  (str(): {plain})")
+
+
+if __name__ == "__main__":
+    main()
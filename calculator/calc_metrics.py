@@ -0,0 +1,100 @@
+"""
+Opt-in metrics of the calculator GUI, in Prometheus text format.
+
+CalculatorMetrics holds what script2.enable_metrics measures: the time from
+'=' to its result or error, how many evaluations succeeded or failed, and
+the time to handle a key press. render() writes them in the Prometheus text
+exposition format; serve() exposes that over HTTP and dump_on_exit() writes
+it to stderr when the program exits. Nothing here runs unless the
+calculator is started with --metrics-port or --metrics-dump.
+"""
+import atexit
+import bisect
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, from 1 microsecond to 10 seconds
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+           1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Histogram:
+    """Counts of observed durations per bucket of BUCKETS, with their sum"""
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+    def lines(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            yield f'{self.name}_bucket{{le="{le}"}} {cumulative}'
+        yield f"{self.name}_sum {self.sum}"
+        yield f"{self.name}_count {cumulative}"
+
+
+class CalculatorMetrics:
+    """CalculatorMetrics()
+
+    evaluated(ok, seconds) records the outcome of one '=' and the time it
+    took; key presses are timed into click_event.
+    """
+
+    def __init__(self):
+        self.evaluation = _Histogram('calc_evaluation_seconds', "Time from '=' to its result or error")
+        self.click_event = _Histogram('calc_click_event_seconds', "Time to handle a key press")
+        self.outcomes = {'ok': 0, 'error': 0}
+
+    def evaluated(self, ok, seconds):
+        self.evaluation.observe(seconds)
+        self.outcomes['ok' if ok else 'error'] += 1
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = [*self.click_event.lines(), *self.evaluation.lines(),
+                 "# HELP calc_evaluations_total Expressions evaluated by '=', by outcome",
+                 "# TYPE calc_evaluations_total counter"]
+        lines += [f'calc_evaluations_total{{outcome="{outcome}"}} {count}'
+                  for outcome, count in self.outcomes.items()]
+        return '\n'.join(lines) + '\n'
+
+
+def serve(metrics, port, host='127.0.0.1'):
+    """Serve /metrics from a background thread and return the server"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes are not worth a line on stderr each
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
+
+
+def dump_on_exit(metrics, stream=None):
+    """Write the metrics to stream (stderr by default) when the program exits"""
+    atexit.register(lambda: (stream or sys.stderr).write(metrics.render()))
@@ -0,0 +1,121 @@
+"""
+Display text for calculator results.
+
+str() of a huge integer takes time quadratic in its length and fails beyond
+CPython's int to str digit limit, and the display only has room for a couple
+of dozen characters anyway. In the default 'scaled' mode, format_result
+shows integers with more than max_digits digits in scientific notation,
+working out the exponent and leading digits from the bit length and the top
+bits alone, so formatting takes about the same time whatever the size.
+
+The exact modes show a result's whole value instead. 'decimal' writes
+integers in full, converted through the decimal module (subquadratic, with
+no digit limit), and floats as the exact decimal value of their binary
+fraction. 'fraction' writes integers the same way and floats as an exact
+numerator/denominator.
+
+Whatever the mode, a calculation that carries on from a result continues
+from exact_text, never from the display text.
+"""
+import decimal
+from decimal import Decimal
+
+MODES = ('scaled', 'decimal', 'fraction')
+MAX_DIGITS = 20
+PRECISION = 16  # significant digits of scientific notation, as for floats
+
+# Leading bits of an integer used for its logarithm; far more than the
+# PRECISION digits need
+_TOP_BITS = 128
+# Integers up to this many bits are converted to Decimal directly
+_DIRECT_BITS = 1024
+
+
+def format_result(value, mode='scaled', max_digits=MAX_DIGITS, precision=PRECISION):
+    """The text to display for an int or float result"""
+    if mode not in MODES:
+        raise ValueError(f"Unknown display mode: {mode}")
+    if isinstance(value, int):
+        if mode != 'scaled':
+            return str(int_to_decimal(value))
+        if abs(value) < 10 ** max_digits:
+            return str(value)
+        return scientific(value, precision)
+    if isinstance(value, float) and value == value and abs(value) != float('inf'):
+        if mode == 'decimal':
+            return str(Decimal(value))
+        if mode == 'fraction':
+            numerator, denominator = value.as_integer_ratio()
+            if denominator == 1:
+                return str(int_to_decimal(numerator))
+            return f"{numerator}/{denominator}"
+    return str(value)
+
+
+def exact_text(value):
+    """
+    The text of a result to continue a calculation from: integers in full,
+    whatever their size, and anything else as str(), which evaluates back to
+    the same value
+    """
+    if isinstance(value, int):
+        return str(int_to_decimal(value))
+    return str(value)
+
+
+def scientific(value, precision=PRECISION):
+    """
+    An integer in scientific notation with `precision` significant digits,
+    computed from its top bits. The digits are exact unless the value lies
+    within about 2**-100 of a rounding boundary.
+    """
+    sign = '-' if value < 0 else ''
+    value = abs(value)
+    shift = max(value.bit_length() - _TOP_BITS, 0)
+    with decimal.localcontext() as context:
+        # Room for the exponent's digits as well as the mantissa's
+        context.prec = precision + 30
+        log = Decimal(value >> shift).log10() + shift * Decimal(2).log10()
+        exponent = int(log)
+        mantissa = Decimal(10) ** (log - exponent)
+        context.prec = precision
+        mantissa = +mantissa
+        if mantissa >= 10:
+            mantissa /= 10
+            exponent += 1
+        digits = format(mantissa.normalize(), 'f')
+    return f"{sign}{digits}e+{exponent}"
+
+
+def int_to_decimal(value):
+    """
+    An exact Decimal of an integer of any size, by splitting it into halves
+    recursively so that the decimal module's fast multiplication does the work
+    """
+    powers = {}
+
+    def power_of_two(bits):
+        result = powers.get(bits)
+        if result is None:
+            if bits <= _DIRECT_BITS:
+                result = Decimal(2) ** bits
+            else:
+                half = bits >> 1
+                result = power_of_two(half) * power_of_two(bits - half)
+            powers[bits] = result
+        return result
+
+    def convert(n, bits):
+        if bits <= _DIRECT_BITS:
+            return Decimal(n)
+        half = bits >> 1
+        high = n >> half
+        low = n - (high << half)
+        return convert(high, bits - half) * power_of_two(half) + convert(low, half)
+
+    with decimal.localcontext() as context:
+        context.prec = decimal.MAX_PREC
+        context.Emax = decimal.MAX_EMAX
+        context.traps[decimal.Inexact] = True
+        result = convert(abs(value), value.bit_length())
+        return -result if value < 0 else result
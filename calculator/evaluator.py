@@ -0,0 +1,304 @@
+"""
+Non-recursive arithmetic expression compiler and evaluator.
+
+An expression is compiled into a Program: a flat list of instructions in
+reverse Polish order, run with an explicit value stack. Compiling uses a
+hand-written tokenizer and a shunting-yard parser, so both steps take
+linear time with no recursion, whatever the length or nesting of the
+expression.
+
+The language follows the original ast-walking safe_eval: Python numeric
+literals (integers, floats and imaginary numbers) combined with
++ - * / % ** and unary signs, with Python's precedence and associativity.
+Inputs the tokenizer does not handle itself (comments, line continuations,
+True/False, imaginary literals, ...) are parsed with ast and checked
+against the same node types as the original before being converted to the
+same kind of Program.
+
+Expressions hold nothing but literals, so a Program always evaluates to the
+same value: the first successful run keeps its result if it is small (up to
+MAX_KEPT_BITS for an integer), and running the Program again only returns
+it, after checking it against the size budget. Nothing is ever handed to
+Python's eval or compile.
+
+safe_eval() is the entry point for evaluating text: it keeps the Programs
+of recently used expressions in an LRU cache. This module has no GUI
+dependencies, so worker processes and the batch evaluator use it directly.
+
+run() can be given a size budget in bits for integer results: products and
+powers whose size estimate exceeds it raise OverflowError before anything
+is computed, so 9**9**9 is rejected at once instead of running for hours.
+"""
+import ast
+import functools
+import math
+import operator
+import re
+
+# A real Python numeric literal: based integers, floats or decimal integers, not run together with a following name or number.
+# [0-9] rather than \d, which would also match non-ASCII digits.
+_DIGITS = r'[0-9](?:_?[0-9])*'
+_FLOAT = rf'(?:(?:{_DIGITS})?\.{_DIGITS}|{_DIGITS}\.)(?:[eE][-+]?{_DIGITS})?|{_DIGITS}[eE][-+]?{_DIGITS}'
+_NUMBER = rf'''
+    0[xX](?:_?[0-9a-fA-F])+ | 0[oO](?:_?[0-7])+ | 0[bB](?:_?[01])+
+  | {_FLOAT}
+  | [1-9](?:_?[0-9])* | 0(?:_?0)*
+'''
+# Each token is (number, operator, other); anything in `other` is outside
+# the tokenizer's grammar.
+_TOKENS = re.compile(rf'''
+    [ \t\f]*
+    (?:
+        ((?:{_NUMBER})(?![0-9a-zA-Z_.]))
+      | (\*\*|[-+*/%()])
+      | (.)
+    )
+''', re.VERBOSE | re.DOTALL)
+
+BINARY = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '**': operator.pow,
+}
+UNARY = {
+    '+': operator.pos,
+    '-': operator.neg,
+}
+
+# Parser entries: (binding strength, instruction). Unary signs sit between
+# * and **, so -2**2 is -(2**2) while 2**-2 is 2**(-2), as in Python.
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, '%': 2, '**': 4}
+_UNARY_PRECEDENCE = 3
+_BINARY_ENTRIES = {symbol: (_PRECEDENCE[symbol], (function, 2)) for symbol, function in BINARY.items()}
+_UNARY_ENTRIES = {symbol: (_UNARY_PRECEDENCE, (function, 1)) for symbol, function in UNARY.items()}
+_OPEN = '('
+EVAL_CACHE_SIZE = 1024
+# Largest integer result a Program keeps, so that the cache of EVAL_CACHE_SIZE
+# Programs stays small whatever the results
+MAX_KEPT_BITS = 1024
+_SPACE = ' \t\f'
+
+_MUL = operator.mul
+_POW = operator.pow
+
+_AST_BINARY = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Mod: '%', ast.Pow: '**'}
+_AST_UNARY = {ast.UAdd: '+', ast.USub: '-'}
+
+
+class Program(list):
+    """
+    A compiled expression: a list of (function, argument) instructions in
+    reverse Polish order. A literal is (None, value); an operator is
+    (function, 1) for unary or (function, 2) for binary.
+
+    source is the expression text. After the first successful run with a
+    result small enough to keep (see MAX_KEPT_BITS), value is that result
+    and bits the size of the largest integer product or power it computed
+    (see result_bits); bits is None until then.
+    """
+
+    __slots__ = ('source', 'value', 'bits')
+
+    def __init__(self, source=''):
+        super().__init__()
+        self.source = source
+        self.value = None
+        self.bits = None
+
+
+class _Unsupported(Exception):
+    """The fast tokenizer cannot handle this input; use the ast path"""
+
+
+def result_bits(function, left, right):
+    """
+    The size in bits of an integer product or power, estimated to within a
+    bit without computing it; 0 for other operations, non-integer operands
+    and negative exponents
+    """
+    if not (isinstance(left, int) and isinstance(right, int)):
+        return 0
+    if function is operator.mul:
+        return left.bit_length() + right.bit_length()
+    if function is operator.pow and right > 0 and abs(left) > 1:
+        return int(right * math.log2(abs(left))) + 1
+    return 0
+
+
+def run(program, max_bits=None):
+    """
+    Evaluate a compiled Program, raising OverflowError instead if an integer
+    product or power would take more than max_bits bits
+    """
+    if program.bits is None:
+        value, bits = _execute(program, max_bits)
+        if not isinstance(value, int) or value.bit_length() <= MAX_KEPT_BITS:
+            program.value = value
+            program.bits = bits
+        return value
+    if max_bits is not None and program.bits > max_bits:
+        raise OverflowError("Result would be too large")
+    return program.value
+
+
+def _execute(program, max_bits):
+    """The value of a Program and the most bits any of its products or powers took"""
+    limit = math.inf if max_bits is None else max_bits
+    bits = 0
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for function, argument in program:
+        if function is None:
+            push(argument)
+        elif argument == 2:
+            right = pop()
+            if function is _MUL or function is _POW:
+                needed = result_bits(function, stack[-1], right)
+                if needed > bits:
+                    if needed > limit:
+                        raise OverflowError("Result would be too large")
+                    bits = needed
+            stack[-1] = function(stack[-1], right)
+        else:
+            stack[-1] = function(stack[-1])
+    return stack[0], bits
+
+
+def compile_expression(expr):
+    """
+    Compile an expression into a Program, raising SyntaxError or ValueError
+    for anything that is not plain arithmetic on numeric literals.
+    """
+    try:
+        return _compile_tokens(expr)
+    except _Unsupported:
+        return _compile_ast(expr)
+
+
+def _literal(text):
+    try:
+        if text[:2].lower() in ('0x', '0o', '0b'):
+            return int(text, 0)
+        if '.' in text or 'e' in text or 'E' in text:
+            return float(text)
+        return int(text, 0)
+    except ValueError:  # e.g. longer than the int string conversion limit
+        raise _Unsupported from None
+
+
+def _compile_tokens(expr):
+    """Tokenize and parse with the shunting-yard algorithm"""
+    if expr[:1] in _SPACE:
+        raise _Unsupported  # Python rejects indented (and empty) expressions
+    program = Program(expr)
+    emit = program.append
+    operators = []  # pending (precedence, instruction) pairs and _OPEN, innermost last
+    push = operators.append
+    pop = operators.pop
+    expect_operand = True
+
+    for number, symbol, other in _TOKENS.findall(expr.rstrip(' \t\f')):
+        if expect_operand:
+            if number:
+                emit((None, _literal(number)))
+                expect_operand = False
+            elif symbol == '(':
+                push(_OPEN)
+            elif symbol in _UNARY_ENTRIES:
+                push(_UNARY_ENTRIES[symbol])
+            else:
+                raise _Unsupported
+        elif symbol == ')':
+            while operators and operators[-1] is not _OPEN:
+                emit(pop()[1])
+            if not operators:
+                raise _Unsupported
+            pop()
+        elif symbol in _BINARY_ENTRIES:
+            entry = _BINARY_ENTRIES[symbol]
+            # Apply pending operators that bind at least as tightly, except
+            # for the right-associative ** which waits for its right operand.
+            precedence = entry[0]
+            if symbol == '**':
+                precedence += 1
+            while operators and operators[-1] is not _OPEN and operators[-1][0] >= precedence:
+                emit(pop()[1])
+            push(entry)
+            expect_operand = True
+        else:
+            raise _Unsupported
+
+    if expect_operand:
+        raise _Unsupported
+    while operators:
+        entry = pop()
+        if entry is _OPEN:
+            raise _Unsupported
+        emit(entry[1])
+    return program
+
+
+def _compile_ast(expr):
+    """Parse with ast and convert the validated tree with an explicit stack"""
+    tree = ast.parse(expr, mode='eval')
+    program = Program(expr)
+    # Post-order walk: a node is emitted after its children (visited=True)
+    stack = [(tree.body, False)]
+    while stack:
+        node, visited = stack.pop()
+        if isinstance(node, ast.BinOp):
+            symbol = _AST_BINARY.get(type(node.op))
+            if symbol is None:
+                raise ValueError("Unsupported binary operator")
+            if visited:
+                program.append((BINARY[symbol], 2))
+            else:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+        elif isinstance(node, ast.UnaryOp):
+            symbol = _AST_UNARY.get(type(node.op))
+            if symbol is None:
+                raise ValueError("Unsupported unary operator")
+            if visited:
+                program.append((UNARY[symbol], 1))
+            else:
+                stack.append((node, True))
+                stack.append((node.operand, False))
+        elif isinstance(node, ast.Constant):
+            # Imaginary literals too: the original safe_eval matched ast.Num,
+            # which covers int, float and complex constants
+            if not isinstance(node.value, (int, float, complex)):
+                raise ValueError("Unsupported constant type")
+            program.append((None, node.value))
+        else:
+            raise ValueError("Unsupported expression")
+    return program
+
+
+@functools.lru_cache(maxsize=EVAL_CACHE_SIZE)
+def compile_cached(expr):
+    """
+    compile_expression, cached by expression string: repeated evaluations
+    of the same formula skip parsing and validation entirely
+    """
+    return compile_expression(expr)
+
+
+def safe_eval(expr, max_bits=None):
+    """
+    Safely evaluate a numeric expression containing only literals and
+    arithmetic operators (+, -, *, /, %, **, unary + and -). With max_bits,
+    integer results estimated to need more bits raise OverflowError before
+    being computed.
+    """
+    return run(compile_cached(expr), max_bits)
+
+
+def eval_cache_info():
+    """Hit/miss statistics of the compiled-expression cache"""
+    return compile_cached.cache_info()
@@ -0,0 +1,184 @@
+"""
+Live preview of the calculator's result while an expression is typed.
+
+The calculator's keys only ever append to the expression, so Preview keeps
+the partially evaluated expression instead of its text: the sum of the
+finished terms, the product (or quotient) of the current term's finished
+factors, the pending operators and the number being typed. Each key updates
+that state with a bounded number of arithmetic operations, however long the
+expression has become. The only exception is a chain of powers (×× is **),
+which is right-associative and so is re-evaluated from its end.
+
+Operations run in the same order and with the same operators and size
+budget as evaluator.run, so the preview is exactly the text '=' would show,
+or '' when '=' would fail or the expression is still incomplete.
+"""
+import operator
+import re
+import sys
+
+from display import format_result
+from evaluator import result_bits
+from worker import MAX_RESULT_BITS
+
+# How a float result is displayed, which '=' leaves in the expression
+_FLOAT_TEXT = re.compile(r'[0-9]+(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?')
+
+
+class _Invalid(Exception):
+    """The expression can no longer be evaluated, whatever is appended"""
+
+
+class Preview:
+    """Preview(max_bits=MAX_RESULT_BITS, mode='scaled')
+
+    push() appends one key (a digit or + - × ÷, or * /) and text is the
+    result the expression typed so far evaluates to. reset() starts over,
+    from nothing or from the text of an '=' result. Results over max_bits
+    bits are not previewed, as evaluator.run refuses them; keep a budget so
+    that typing can never block the GUI. mode is the display mode of '=',
+    one of display.MODES.
+    """
+
+    def __init__(self, max_bits=MAX_RESULT_BITS, mode='scaled'):
+        self.max_bits = max_bits
+        self.mode = mode
+        self.reset()
+
+    def reset(self, text=''):
+        """Start over with the expression text, '' or an '=' result"""
+        self._invalid = False
+        self._total = None       # value of the finished terms
+        self._add = None         # operator between them and the current term
+        self._product = None     # value of the current term's finished factors
+        self._multiply = None    # operator between them and the current factor
+        self._powers = []        # (negate, base) of each pending ** in the factor
+        self._negate = False     # odd number of unary minus signs on the number
+        self._star = False       # a × was just typed: * or the start of **
+        self._digits = 0         # length of the number being typed; 0 between numbers
+        self._value = 0
+        self._float_text = None  # text of a float number, converted as a whole
+        if text.startswith('-'):
+            self._negate = True
+            text = text[1:]
+        if _FLOAT_TEXT.fullmatch(text) and not text.isdigit():
+            self._float_text = text
+            self._value = float(text)
+            self._digits = len(text)
+        else:
+            # Integers and fractions are typed in as keys; anything else,
+            # such as inf or nan, is not a literal
+            for key in text:
+                self.push(key)
+
+    def push(self, key):
+        """Append one key to the expression"""
+        if self._invalid:
+            return
+        try:
+            if key.isdigit():
+                self._push_digit(key)
+            elif key in ('×', '*'):
+                self._push_times()
+            elif key in ('÷', '/'):
+                self._push_divide()
+            elif key in ('+', '-'):
+                self._push_sign(key)
+            else:
+                raise _Invalid
+        except (_Invalid, ArithmeticError):
+            self._invalid = True
+
+    def _push_digit(self, digit):
+        if self._star:
+            self._end_factor(operator.mul)
+        if self._float_text is not None:
+            self._float_text += digit
+            self._value = float(self._float_text)
+        else:
+            if self._digits and not self._value and digit != '0':
+                raise _Invalid  # a decimal number with a leading zero, like 05
+            self._value = self._value * 10 + int(digit)
+        self._digits += 1
+        limit = sys.get_int_max_str_digits()
+        if self._float_text is None and limit and self._digits > limit:
+            raise _Invalid  # Python refuses to read such a long literal
+
+    def _push_times(self):
+        if self._star:
+            # ×× is **: the number becomes the base of a power
+            self._powers.append((self._negate, self._value))
+            self._star = False
+            self._next_number()
+        elif self._digits:
+            self._star = True
+        else:
+            raise _Invalid
+
+    def _push_divide(self):
+        if self._star or not self._digits:
+            raise _Invalid
+        self._end_factor(operator.truediv)
+
+    def _push_sign(self, sign):
+        if self._star:
+            self._end_factor(operator.mul)
+        if self._digits:
+            self._end_term(operator.add if sign == '+' else operator.sub)
+        elif sign == '-':
+            self._negate = not self._negate  # a unary sign
+
+    def _next_number(self):
+        self._negate = False
+        self._digits = 0
+        self._value = 0
+        self._float_text = None
+
+    def _end_factor(self, function):
+        self._product = self._term()
+        self._multiply = function
+        self._powers = []
+        self._star = False
+        self._next_number()
+
+    def _end_term(self, function):
+        self._total = self._sum(self._term())
+        self._add = function
+        self._product = None
+        self._multiply = None
+        self._powers = []
+        self._next_number()
+
+    def _apply(self, function, left, right):
+        if self.max_bits is not None and result_bits(function, left, right) > self.max_bits:
+            raise OverflowError("Result would be too large")
+        return function(left, right)
+
+    def _factor(self):
+        """The value of the current factor, ending with the number being typed"""
+        value = -self._value if self._negate else self._value
+        for negate, base in reversed(self._powers):
+            value = self._apply(operator.pow, base, value)
+            if negate:
+                value = -value
+        return value
+
+    def _term(self):
+        if self._multiply is None:
+            return self._factor()
+        return self._apply(self._multiply, self._product, self._factor())
+
+    def _sum(self, term):
+        if self._add is None:
+            return term
+        return self._apply(self._add, self._total, term)
+
+    @property
+    def text(self):
+        """The result as '=' would show it, or '' if it would show an error"""
+        if self._invalid or self._star or not self._digits:
+            return ''
+        try:
+            return format_result(self._sum(self._term()), self.mode)
+        except ArithmeticError:
+            return ''
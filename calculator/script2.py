@@ -4,54 +4,19 @@ Buttons for 0-9 digits.
 Buttons for +, -, ×, ÷.
 Button for =.
 """
+import argparse
+import functools
+import time
 import tkinter as tk
 from tkinter import messagebox
-import ast
 
-def safe_eval(expr):
-    """
-    Safely evaluate a numeric expression containing only literals and
-    arithmetic operators (+, -, *, /, %, **, unary + and -).
-    """
-    def _eval(node):
-        if isinstance(node, ast.Expression):
-            return _eval(node.body)
-        if isinstance(node, ast.BinOp):
-            left = _eval(node.left)
-            right = _eval(node.right)
-            if isinstance(node.op, ast.Add):
-                return left + right
-            if isinstance(node.op, ast.Sub):
-                return left - right
-            if isinstance(node.op, ast.Mult):
-                return left * right
-            if isinstance(node.op, ast.Div):
-                return left / right
-            if isinstance(node.op, ast.Mod):
-                return left % right
-            if isinstance(node.op, ast.Pow):
-                return left ** right
-            raise ValueError("Unsupported binary operator")
-        if isinstance(node, ast.UnaryOp):
-            operand = _eval(node.operand)
-            if isinstance(node.op, ast.UAdd):
-                return +operand
-            if isinstance(node.op, ast.USub):
-                return -operand
-            raise ValueError("Unsupported unary operator")
-        if isinstance(node, ast.Num):  # Python <3.8
-            return node.n
-        if isinstance(node, ast.Constant):  # Python 3.8+
-            if isinstance(node.value, (int, float)):
-                return node.value
-            raise ValueError("Unsupported constant type")
-        raise ValueError("Unsupported expression")
-
-    parsed = ast.parse(expr, mode='eval')
-    return _eval(parsed)
+import calc_metrics
+from evaluator import eval_cache_info, safe_eval  # noqa: F401 - part of this module's interface
+from preview import Preview
+from worker import MAX_RESULT_BITS, EvaluationWorker
 
 class Calculator:
-    """Calculator(master)
+    """Calculator(master, worker=None)
 
     A simple Tkinter-based calculator widget class that constructs a basic GUI and
     handles button-driven arithmetic input and evaluation.
@@ -59,8 +24,9 @@ class Calculator:
     This class builds a 4-column grid of buttons and a single-line entry display.
     It supports the decimal digits 0-9, the basic binary operators + and -, and the
     multiplication and division symbols × and ÷ (mapped to Python's '*' and '/').
-    The '=' button evaluates the current expression using a provided safe_eval
-    function; the 'C' button clears the current expression.
+    The '=' button evaluates the current expression with safe_eval in a
+    worker process and shows the result when it arrives; the 'C' button clears
+    the current expression.
 
     Parameters
     ----------
@@ -68,6 +34,9 @@ class Calculator:
         The parent Tkinter container in which the calculator widgets will be
         created. The caller is responsible for providing an appropriate Tk/Toplevel
         or Frame instance.
+    worker : worker.EvaluationWorker, optional
+        Evaluates expressions off the main thread within its time and size
+        budgets; a default EvaluationWorker is started if omitted.
 
     Class Attributes
     ----------------
@@ -77,6 +46,8 @@ class Calculator:
         Horizontal padding for each button (default 20).
     BUTTON_PADY : int
         Vertical padding for each button (default 20).
+    POLL_INTERVAL_MS : int
+        How often a pending evaluation is checked for its result (default 20).
 
     Instance Attributes
     -------------------
@@ -88,28 +59,44 @@ class Calculator:
         Tkinter variable bound to the Entry widget, used for display/updates.
     entry : tkinter.Entry
         The text entry widget used to show the current expression/result.
+    worker : worker.EvaluationWorker
+        The process evaluating expressions.
+    preview : preview.Preview
+        Incremental evaluation of the expression as it is typed, with the
+        worker's size budget and display mode.
+    preview_text : tkinter.StringVar
+        Tkinter variable bound to the preview Label below the Entry, showing
+        the result '=' would give, or nothing if it would give an error.
 
     Public Methods
     --------------
     __init__(master)
-        Create and lay out the Entry widget and calculator Buttons in a 4-column
-        grid. Each button is bound to click_event via a lambda capturing the
+        Create and lay out the Entry widget, the preview Label and calculator
+        Buttons in a 4-column grid. Each button is bound to click_event via a lambda capturing the
         button label.
 
     click_event(key)
         Handle a button press. Behavior depends on key:
-        - '=' : Replace '×' and '÷' with '*' and '/', evaluate the expression using
-          safe_eval(expr), and update the display with the result. On evaluation
-          errors, show an error dialog via messagebox.showerror and clear state.
-        - 'C' : Clear the expression and display.
-        - other : Append the key string to the expression and update the display.
+        - '=' : Replace '×' and '÷' with '*' and '/' and submit the expression to
+          the worker; poll_result shows the result once it is ready.
+        - 'C' : Clear the expression, display and preview.
+        - other : Append the key string to the expression, update the display and
+          push the key to the preview.
+        Any key abandons an evaluation that is still pending.
+
+    poll_result()
+        Check the worker for the pending result, rescheduling itself with
+        master.after until it arrives. On success update the display with the
+        result and restart the preview from it; on an invalid input, a result
+        over budget or a timeout, show an error dialog via messagebox.showerror
+        and clear state.
 
     Notes
     -----
     - This class assumes the following names are available in the module scope:
-      tk (tkinter), safe_eval (a function that evaluates arithmetic expressions
-      safely), and messagebox (tkinter.messagebox). They are not provided by this
-      class and must be imported/defined by the caller/module.
+      tk (tkinter), EvaluationWorker (worker.EvaluationWorker, whose child process
+      calls evaluator.safe_eval), and messagebox (tkinter.messagebox). They are
+      not provided by this class and must be imported/defined by the caller/module.
     # Comment: safe_eval MUST be safe and sandboxed; do not use eval on untrusted input.
     # Comment: The multiplication/division symbols are user-facing; they are mapped
     #          to Python operators before evaluation.
@@ -131,21 +118,27 @@ class Calculator:
     BUTTON_FONT = ('arial', 18)
     BUTTON_PADX = 20
     BUTTON_PADY = 20
+    POLL_INTERVAL_MS = 20
 
-    def __init__(self, master):
+    def __init__(self, master, worker=None):
         self.master = master
         master.title("Simple Calculator")
+        self.worker = worker or EvaluationWorker()
+        self.worker.start()
         self.expression = ""
         self.text_input = tk.StringVar()
         self.entry = tk.Entry(master, font=('arial', 20, 'bold'), textvariable=self.text_input, bd=20, insertwidth=4, bg="powder blue", justify='right')
         self.entry.grid(row=0, column=0, columnspan=4)
+        self.preview = Preview(self.worker.max_bits or MAX_RESULT_BITS, self.worker.mode)
+        self.preview_text = tk.StringVar()
+        tk.Label(master, textvariable=self.preview_text, font=('arial', 14), anchor='e').grid(row=1, column=0, columnspan=4, sticky='ew')
         buttons = [
             '7', '8', '9', '+',
             '4', '5', '6', '-',
             '1', '2', '3', '×',
             '0', '=', 'C', '÷'
         ]
-        row_val = 1
+        row_val = 2
         col_val = 0
         for button in buttons:
             action = lambda x=button: self.click_event(x)
@@ -156,24 +149,80 @@ class Calculator:
                 row_val += 1
 
     def click_event(self, key):
+        self.worker.cancel()
         if key == '=':
-            try:
-                expr = self.expression.replace('×', '*').replace('÷', '/')
-                result = str(safe_eval(expr))
-                self.text_input.set(result)
-                self.expression = result
-            except Exception:
-                messagebox.showerror("Error", "Invalid Input")
-                self.expression = ""
-                self.text_input.set("")
+            expr = self.expression.replace('×', '*').replace('÷', '/')
+            self.worker.submit(expr)
+            self.master.after(self.POLL_INTERVAL_MS, self.poll_result)
         elif key == 'C':
             self.expression = ""
             self.text_input.set("")
+            self.preview.reset()
+            self.preview_text.set("")
         else:
             self.expression += str(key)
             self.text_input.set(self.expression)
+            self.preview.push(str(key))
+            self.preview_text.set(self.preview.text)
+
+    def poll_result(self):
+        outcome = self.worker.poll()
+        if outcome is None:
+            if self.worker.busy:
+                self.master.after(self.POLL_INTERVAL_MS, self.poll_result)
+            return  # still running, or abandoned by a later key press
+        ok, text = outcome
+        if ok:
+            # Only the Entry is scaled: carry on from the whole value
+            self.text_input.set(text)
+            self.expression = self.worker.exact
+        else:
+            messagebox.showerror("Error", text)
+            self.expression = ""
+            self.text_input.set("")
+        self.preview.reset(self.expression)
+        self.preview_text.set(self.preview.text)
+
+def enable_metrics(port=None, dump=False):
+    """
+    Measure evaluations and key presses, serving the metrics over HTTP on
+    port and/or writing them to stderr at exit (see calc_metrics.py).
+    Returns the CalculatorMetrics being recorded.
+    """
+    recorded = calc_metrics.CalculatorMetrics()
+    poll = EvaluationWorker.poll
+    click_event = Calculator.click_event
+
+    @functools.wraps(poll)
+    def timed_poll(worker):
+        outcome = poll(worker)
+        if outcome is not None:
+            recorded.evaluated(outcome[0], worker.elapsed)
+        return outcome
+
+    @functools.wraps(click_event)
+    def timed_click_event(calculator, key):
+        start = time.perf_counter()
+        click_event(calculator, key)
+        recorded.click_event.observe(time.perf_counter() - start)
+
+    EvaluationWorker.poll = timed_poll
+    Calculator.click_event = timed_click_event
+    if port is not None:
+        calc_metrics.serve(recorded, port)
+    if dump:
+        calc_metrics.dump_on_exit(recorded)
+    return recorded
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simple calculator.")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve metrics in Prometheus text format on localhost:PORT")
+    parser.add_argument('--metrics-dump', action='store_true',
+                        help="write the metrics to stderr on exit")
+    args = parser.parse_args()
+    if args.metrics_port is not None or args.metrics_dump:
+        enable_metrics(args.metrics_port, args.metrics_dump)
     root = tk.Tk()
     calculator = Calculator(root)
     root.mainloop()
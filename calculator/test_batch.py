@@ -0,0 +1,51 @@
+import io
+import os
+import random
+import subprocess
+import sys
+import unittest
+
+from batch import run_batch
+from worker import INVALID_MESSAGE, TOO_LARGE_MESSAGE, evaluate
+
+
+class TestBatch(unittest.TestCase):
+
+    def run_batch(self, text, **kwargs):
+        out = io.StringIO()
+        err = io.StringIO()
+        counts = run_batch(io.StringIO(text), out, err=err, **kwargs)
+        return out.getvalue(), err.getvalue(), counts
+
+    def test_results_and_errors(self):
+        """Test that every line gets an output line and errors are reported"""
+        out, err, counts = self.run_batch("1+2\n\n1/0\n2*3 \n9**9**9\n", workers=1)
+        self.assertEqual(out, "3\n\n\n6\n\n")
+        self.assertEqual(err, f"line 3: {INVALID_MESSAGE}\nline 5: {TOO_LARGE_MESSAGE}\n")
+        self.assertEqual(counts, (5, 2))
+
+    def test_order_and_deduplication(self):
+        """Test input order across chunks, in-flight and cached duplicates"""
+        rng = random.Random(0)
+        exprs = [f"{rng.randint(0, 30)}*{rng.randint(0, 9)}/{rng.randint(0, 3)}" for _ in range(2000)]
+        expected = ''.join((text if ok else '') + '\n' for ok, text in map(evaluate, exprs))
+        text = '\n'.join(exprs) + '\n'
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                out, err, counts = self.run_batch(text, workers=workers, chunk_size=37, cache_size=50)
+                self.assertEqual(out, expected)
+                self.assertEqual(counts, (2000, err.count('\n')))
+
+    def test_runs_without_tkinter(self):
+        """Test that batch evaluation never imports the GUI"""
+        code = ("import sys; sys.modules['tkinter'] = None; import batch; "
+                "sys.exit(batch.main(['--workers', '2']))")
+        result = subprocess.run([sys.executable, '-c', code], input="1+2\n2**10\n",
+                                capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, "3\n1024\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+
+from calc_metrics import CalculatorMetrics
+
+
+class TestCalculatorMetrics(unittest.TestCase):
+
+    def test_render(self):
+        """Test that evaluations and key presses are rendered in Prometheus text format"""
+        recorded = CalculatorMetrics()
+        recorded.evaluated(True, 0.002)
+        recorded.evaluated(False, 20.0)
+        recorded.click_event.observe(1e-6)
+        text = recorded.render()
+        self.assertIn('calc_evaluations_total{outcome="ok"} 1\n', text)
+        self.assertIn('calc_evaluations_total{outcome="error"} 1\n', text)
+        self.assertIn('calc_evaluation_seconds_bucket{le="0.0025"} 1\n', text)
+        self.assertIn('calc_evaluation_seconds_bucket{le="+Inf"} 2\n', text)
+        self.assertIn('calc_evaluation_seconds_count 2\n', text)
+        self.assertIn('calc_click_event_seconds_bucket{le="1e-06"} 1\n', text)
+        self.assertIn("# TYPE calc_click_event_seconds histogram\n", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from decimal import Decimal
+
+from display import exact_text, format_result, int_to_decimal, scientific
+
+
+class TestDisplay(unittest.TestCase):
+
+    def test_scaled(self):
+        """Test that only integers too long for the display are scaled"""
+        self.assertEqual(format_result(10**20 - 1), '99999999999999999999')
+        self.assertEqual(format_result(10**20), '1e+20')
+        self.assertEqual(format_result(-2**100), '-1.267650600228229e+30')
+        self.assertEqual(format_result(9**(9**7))[-9:], 'e+4564112')
+        self.assertEqual(format_result(0.1), '0.1')
+        self.assertEqual(format_result(float('inf')), 'inf')
+
+    def test_scientific_digits(self):
+        """Test leading digits against exact conversion, including rounding up"""
+        for value in [3**500, 7**1000 + 1, 10**400 - 1, 12345678901234565 * 10**300]:
+            digits = str(value)
+            expected = f"{Decimal(digits).scaleb(1 - len(digits)):.15e}"
+            mantissa, exponent = expected.split('e')
+            expected = f"{Decimal(mantissa).normalize():f}e+{int(exponent) + len(digits) - 1}"
+            self.assertEqual(scientific(value), expected)
+
+    def test_exact_modes(self):
+        """Test decimal and fraction display of ints and floats"""
+        self.assertEqual(format_result(10**5000, 'decimal'), '1' + '0' * 5000)
+        self.assertEqual(format_result(0.5, 'decimal'), '0.5')
+        self.assertEqual(format_result(0.1, 'fraction'), '3602879701896397/36028797018963968')
+        self.assertEqual(format_result(-2.0, 'fraction'), '-2')
+        with self.assertRaises(ValueError):
+            format_result(1, 'roman')
+
+    def test_exact_text(self):
+        """Test that the text to continue from evaluates back to the result"""
+        self.assertEqual(exact_text(2**70), '1180591620717411303424')
+        self.assertEqual(exact_text(-10**30), '-1' + '0' * 30)
+        self.assertEqual(exact_text(0.1), '0.1')
+        self.assertEqual(exact_text(2.5e300), '2.5e+300')
+
+    def test_int_to_decimal(self):
+        """Test exact conversion of integers beyond the str() digit limit"""
+        value = 7**20000 - 3
+        text = str(int_to_decimal(value))
+        self.assertEqual(len(text), 16902)
+        self.assertEqual(int(Decimal(text)), value)
+        self.assertEqual(int_to_decimal(-12), Decimal(-12))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import ast
+import builtins
+import unittest
+from unittest import mock
+
+import evaluator
+from evaluator import compile_expression, eval_cache_info, run, safe_eval
+
+
+def evaluate(expr):
+    return run(compile_expression(expr))
+
+
+class TestEvaluator(unittest.TestCase):
+
+    def test_precedence_and_associativity(self):
+        """Test that the tokenizer path follows Python's operator rules"""
+        cases = ['2+3*4', '2*3+4', '10-4-3', '2**3**2', '-2**2', '2**-1', '-(-3)',
+                 '--3', '+-+4', '7%3*2', '(1+2)*(3+4)', '8/4/2', '1_000+0x1f+0o7+0b1',
+                 '.5+5.+1e3+1.5e-2', '00+0']
+        for expr in cases:
+            with self.subTest(expr=expr):
+                self.assertEqual(evaluate(expr), eval(expr))
+
+    def test_tokenizer_handles_plain_arithmetic(self):
+        """Test that ordinary formulas do not fall back to the ast path"""
+        program = evaluator._compile_tokens('(1 + 2) * -3 ** 2')
+        self.assertEqual(run(program), -27)
+
+    def test_fallback_inputs(self):
+        """Test inputs outside the tokenizer's grammar, checked on the ast path"""
+        self.assertEqual(evaluate('True+1'), 2)
+        self.assertEqual(evaluate('1+2 # note'), 3)
+        self.assertEqual(evaluate('1+\\\n2'), 3)
+        self.assertEqual(evaluate('2j*2'), 4j)
+        self.assertEqual(evaluate('1.5J-1'), -1 + 1.5j)
+        for expr in ['', ' 1', '1\n\t', '01', '1__0', '1.e', '(1', '1)', '1 2', '3//2']:
+            with self.subTest(expr=expr), self.assertRaises((ValueError, SyntaxError)):
+                evaluate(expr)
+
+    def test_long_and_deep_expressions(self):
+        """Test that length and nesting are not limited by recursion"""
+        self.assertEqual(evaluate('+'.join(['1'] * 100_000)), 100_000)
+        self.assertEqual(evaluate('(' * 10_000 + '2' + ')' * 10_000), 2)
+        self.assertEqual(evaluate('-' * 10_000 + '1'), 1)
+
+    def test_reused_program_keeps_its_value(self):
+        """Test that a second run returns the first result within the same budget"""
+        program = compile_expression('2**64*3')
+        self.assertIsNone(program.bits)
+        self.assertEqual(run(program), 3 * 2**64)
+        self.assertEqual(program.bits, 65 + 2)
+        self.assertEqual(run(program, max_bits=67), 3 * 2**64)
+        with self.assertRaises(OverflowError):
+            run(program, max_bits=66)
+
+    def test_large_results_are_not_kept(self):
+        """Test that only small results stay pinned to a Program"""
+        program = compile_expression(f'2**{evaluator.MAX_KEPT_BITS}')
+        self.assertEqual(run(program), 2**evaluator.MAX_KEPT_BITS)
+        self.assertIsNone(program.bits)
+        self.assertIsNone(program.value)
+        self.assertEqual(run(program), 2**evaluator.MAX_KEPT_BITS)
+
+    def test_failures_are_not_kept(self):
+        """Test that errors and budget refusals leave the Program unevaluated"""
+        program = compile_expression('2**200')
+        with self.assertRaises(OverflowError):
+            run(program, max_bits=100)
+        self.assertIsNone(program.bits)
+        self.assertEqual(run(program), 2**200)
+        program = compile_expression('1/0')
+        for _ in range(2):
+            with self.assertRaises(ZeroDivisionError):
+                run(program)
+
+
+class TestSafeEval(unittest.TestCase):
+
+    def setUp(self):
+        evaluator.compile_cached.cache_clear()
+
+    def test_arithmetic(self):
+        """Test operators, precedence and unary signs"""
+        self.assertEqual(safe_eval('1+2*3'), 7)
+        self.assertEqual(safe_eval('7%3'), 1)
+        self.assertEqual(safe_eval('-2**2'), -4)
+        self.assertEqual(safe_eval('2**-1'), 0.5)
+        self.assertEqual(safe_eval('(1+2)*3'), 9)
+        self.assertEqual(safe_eval('1.5/0.5'), 3.0)
+
+    def test_rejects_non_arithmetic(self):
+        """Test that names, calls and other operators are refused"""
+        for expr in ['x', '__import__("os")', '3//2', '"a"', "b'1'", 'abs(-1)', '1 < 2']:
+            with self.assertRaises((ValueError, SyntaxError)):
+                safe_eval(expr)
+        with self.assertRaises(ZeroDivisionError):
+            safe_eval('1/0')
+
+    def test_never_executes_python_code(self):
+        """Test that no input reaches eval or is compiled to bytecode"""
+        real_compile = builtins.compile
+
+        def ast_only(source, filename, mode, flags=0, *args, **kwargs):
+            self.assertTrue(flags & ast.PyCF_ONLY_AST, "compiled to bytecode")
+            return real_compile(source, filename, mode, flags, *args, **kwargs)
+
+        with mock.patch('builtins.eval', side_effect=AssertionError("eval called")), \
+                mock.patch('builtins.compile', ast_only):
+            for _ in range(3):  # fresh, then cached
+                self.assertEqual(safe_eval('6*7'), 42)
+                self.assertEqual(safe_eval('6 * (3 + 4)  # comment'), 42)
+
+    def test_size_budget(self):
+        """Test that oversized integer results are refused before computing"""
+        self.assertEqual(safe_eval('2**64', max_bits=100), 2**64)
+        self.assertEqual(safe_eval('1**10**20', max_bits=100), 1)
+        self.assertEqual(safe_eval('2.0**10', max_bits=1), 1024.0)
+        for expr in ['9**9**9', '2**200', '2**60*2**60']:
+            with self.assertRaises(OverflowError):
+                safe_eval(expr, max_bits=100)
+
+    def test_cache_statistics(self):
+        """Test that repeated expressions hit the compiled cache"""
+        for _ in range(3):
+            self.assertEqual(safe_eval('2*21'), 42)
+        self.assertEqual(safe_eval('2*21 '), 42)
+        info = eval_cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
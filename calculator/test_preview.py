@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from preview import Preview
+from worker import evaluate
+
+
+def equals_text(expr, max_bits, mode='scaled'):
+    """What '=' shows for expr, or '' for an error"""
+    ok, text = evaluate(expr.replace('×', '*').replace('÷', '/'), max_bits, mode)
+    return text if ok else ''
+
+
+def typed(keys, start='', max_bits=1000):
+    preview = Preview(max_bits)
+    preview.reset(start)
+    for key in keys:
+        preview.push(key)
+    return preview.text
+
+
+class TestPreview(unittest.TestCase):
+
+    def test_precedence(self):
+        """Test operator precedence, unary signs and powers"""
+        self.assertEqual(typed('1+2×3'), '7')
+        self.assertEqual(typed('7-2-1'), '4')
+        self.assertEqual(typed('-2××2'), '-4')
+        self.assertEqual(typed('2××-1'), '0.5')
+        self.assertEqual(typed('2××3××2'), '512')
+        self.assertEqual(typed('2×-3÷4'), '-1.5')
+        self.assertEqual(typed('--3+-+1'), '2')
+
+    def test_incomplete_or_failing(self):
+        """Test that the preview is blank wherever '=' would fail"""
+        for keys in ['', '1+', '2×', '÷2', '05', '1÷0', '1÷0+2', '2÷÷3', '2×××3', '9××9××9']:
+            with self.subTest(keys=keys):
+                self.assertEqual(typed(keys), '')
+
+    def test_continues_from_result(self):
+        """Test typing on after '=' left a result in the expression"""
+        self.assertEqual(typed('×2', start='2.5'), '5.0')
+        self.assertEqual(typed('5', start='1e+20'), '1e+205')
+        self.assertEqual(typed('555', start='1e+20'), 'inf')
+        self.assertEqual(typed('+1', start='-5'), '-4')
+        self.assertEqual(typed('+1', start='inf'), '')
+        self.assertEqual(typed('×3', start='1/3'), '1.0')
+        self.assertEqual(typed('×1', start='1.8446744073709552e+19'), '1.8446744073709552e+19')
+
+    def test_matches_equals(self):
+        """Test random key sequences against what '=' shows"""
+        rng = random.Random(0)
+        for _ in range(3000):
+            start = rng.choice(['', '', '-5', '2.5', '1e+20', '0', '12', '1/3', '1.5E-7'])
+            max_bits = rng.choice([64, 1000])
+            mode = rng.choice(['scaled', 'decimal', 'fraction'])
+            preview = Preview(max_bits, mode)
+            preview.reset(start)
+            expr = start
+            for _ in range(rng.randint(1, 12)):
+                key = rng.choice('0123456789+-××÷')
+                preview.push(key)
+                expr += key
+                self.assertEqual(preview.text, equals_text(expr, max_bits, mode), expr)
+
+
+if __name__ == '__main__':
+    unittest.main()
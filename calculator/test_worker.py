@@ -0,0 +1,76 @@
+import time
+import unittest
+
+from worker import INVALID_MESSAGE, TIMEOUT_MESSAGE, TOO_LARGE_MESSAGE, EvaluationWorker
+
+
+def wait(worker):
+    while True:
+        outcome = worker.poll()
+        if outcome is not None:
+            return outcome
+        time.sleep(0.01)
+
+
+class TestEvaluationWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = EvaluationWorker(timeout=10)
+        self.addCleanup(self.worker.close)
+
+    def test_result_text(self):
+        """Test that results come back as display text"""
+        self.worker.submit('6*7')
+        start = time.monotonic()
+        self.assertEqual(wait(self.worker), (True, '42'))
+        self.assertFalse(self.worker.busy)
+        self.assertIsNone(self.worker.poll())
+        self.assertLessEqual(self.worker.elapsed, time.monotonic() - start)
+
+    def test_display_modes(self):
+        """Test that huge results are scaled unless an exact mode is chosen"""
+        self.worker.submit('10**5000')
+        self.assertEqual(wait(self.worker), (True, '1e+5000'))
+        self.worker.mode = 'decimal'
+        self.worker.submit('10**5000')
+        self.assertEqual(wait(self.worker), (True, '1' + '0' * 5000))
+
+    def test_continue_from_scaled_result(self):
+        """Test that a scaled result keeps its exact value to calculate on with"""
+        self.worker.submit('2**70')
+        self.assertEqual(wait(self.worker), (True, '1.180591620717411e+21'))
+        self.assertEqual(self.worker.exact, str(2**70))
+        self.worker.submit(self.worker.exact + '-1180591620717411303423')
+        self.assertEqual(wait(self.worker), (True, '1'))
+        self.worker.submit('1/0')
+        wait(self.worker)
+        self.assertIsNone(self.worker.exact)
+
+    def test_errors(self):
+        """Test invalid inputs and results over the size budget"""
+        for expr, expected in [('1+', INVALID_MESSAGE), ('1/0', INVALID_MESSAGE),
+                               ('9**9**9', TOO_LARGE_MESSAGE), ('2**200000', TOO_LARGE_MESSAGE)]:
+            with self.subTest(expr=expr):
+                self.worker.submit(expr)
+                self.assertEqual(wait(self.worker), (False, expected))
+
+    def test_timeout_replaces_child(self):
+        """Test that a runaway calculation is abandoned and the worker recovers"""
+        self.worker.max_bits = None
+        self.worker.timeout = 0.5
+        self.worker.submit('9**9**9')
+        self.assertEqual(wait(self.worker), (False, TIMEOUT_MESSAGE))
+        self.worker.timeout = 10
+        self.worker.submit('1+1')
+        self.assertEqual(wait(self.worker), (True, '2'))
+
+    def test_submit_abandons_pending(self):
+        """Test that only the latest submission's result is returned"""
+        self.worker.max_bits = None
+        self.worker.submit('9**9**9')
+        self.worker.submit('2+3')
+        self.assertEqual(wait(self.worker), (True, '5'))
+
+
+if __name__ == '__main__':
+    unittest.main()
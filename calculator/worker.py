@@ -0,0 +1,150 @@
+"""
+Evaluate calculator expressions in a separate process.
+
+EvaluationWorker keeps one child process that runs safe_eval with a size
+budget and sends back the text to display (see display.format_result), along
+with the exact text of the result to continue from. The caller submits an
+expression and polls for the result, so a GUI can keep handling events
+meanwhile. A calculation that exceeds the time budget is abandoned by
+terminating the child, and a fresh one is started in its place.
+"""
+import multiprocessing
+import time
+
+from display import exact_text, format_result
+from evaluator import safe_eval
+
+# Default budgets: seconds per expression, and bits per integer result
+# (about 30,000 decimal digits)
+TIMEOUT = 2.0
+MAX_RESULT_BITS = 100_000
+
+INVALID_MESSAGE = "Invalid Input"
+TOO_LARGE_MESSAGE = "Result too large"
+TIMEOUT_MESSAGE = "Calculation took too long"
+
+
+def _calculate(expr, max_bits):
+    """(True, value of expr) or (False, error message)"""
+    try:
+        return True, safe_eval(expr, max_bits)
+    except OverflowError:
+        return False, TOO_LARGE_MESSAGE
+    except Exception:
+        return False, INVALID_MESSAGE
+
+
+def evaluate(expr, max_bits=MAX_RESULT_BITS, mode='scaled'):
+    """
+    Evaluate expr with safe_eval and return (True, text to display in the
+    given display mode) or (False, error message)
+    """
+    ok, value = _calculate(expr, max_bits)
+    if not ok:
+        return False, value
+    return True, format_result(value, mode)
+
+
+def _serve(connection):
+    """
+    Child process loop: for each received (expression, max_bits, mode), send
+    (True, display text, exact text) or (False, error message, None)
+    """
+    while True:
+        try:
+            expr, max_bits, mode = connection.recv()
+        except EOFError:
+            return
+        ok, value = _calculate(expr, max_bits)
+        if ok:
+            connection.send((True, format_result(value, mode), exact_text(value)))
+        else:
+            connection.send((False, value, None))
+
+
+class EvaluationWorker:
+    """EvaluationWorker(timeout=TIMEOUT, max_bits=MAX_RESULT_BITS, mode='scaled')
+
+    submit() sends an expression to the child process and poll() returns
+    None while it is being evaluated, then (True, text) on success or
+    (False, message) on an invalid input, a result over max_bits bits or a
+    calculation running over timeout seconds. Only one expression is in
+    flight at a time: submitting another or calling cancel() abandons it.
+    max_bits or timeout may be None for no limit. mode is the display mode
+    of the results, one of display.MODES. exact is the full text of the
+    last result poll() returned (see display.exact_text), for a calculation
+    to continue from, or None after an error. elapsed is the time in seconds
+    from submit() to the last outcome poll() returned.
+    """
+
+    def __init__(self, timeout=TIMEOUT, max_bits=MAX_RESULT_BITS, mode='scaled'):
+        self.timeout = timeout
+        self.max_bits = max_bits
+        self.mode = mode
+        # spawn rather than fork: the parent is usually running Tk
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._connection = None
+        self._deadline = None
+        self._submitted = None
+        self.exact = None
+        self.elapsed = None
+
+    @property
+    def busy(self):
+        return self._deadline is not None
+
+    def start(self):
+        """Start the child process, if it is not already running"""
+        if self._process is None:
+            self._connection, child = self._context.Pipe()
+            self._process = self._context.Process(target=_serve, args=(child,), daemon=True)
+            self._process.start()
+            child.close()
+
+    def submit(self, expr):
+        """Start evaluating expr, abandoning any unfinished expression"""
+        self.cancel()
+        self.start()
+        self._connection.send((expr, self.max_bits, self.mode))
+        self._submitted = time.monotonic()
+        self._deadline = self._submitted + self.timeout if self.timeout is not None else float('inf')
+
+    def poll(self):
+        """The outcome of the submitted expression, or None until it is ready"""
+        if not self.busy:
+            return None
+        if self._connection.poll():
+            self._deadline = None
+            try:
+                ok, text, self.exact = self._connection.recv()
+            except (EOFError, OSError):  # the child died, e.g. out of memory
+                self._stop()
+                ok, text, self.exact = False, INVALID_MESSAGE, None
+        elif time.monotonic() >= self._deadline:
+            self.cancel()
+            ok, text, self.exact = False, TIMEOUT_MESSAGE, None
+        else:
+            return None
+        self.elapsed = time.monotonic() - self._submitted
+        return ok, text
+
+    def cancel(self):
+        """Abandon the submitted expression, replacing the child if it is busy"""
+        if self.busy:
+            self._deadline = None
+            self._stop()
+            self.start()
+
+    def _stop(self):
+        self._process.terminate()
+        self._process.join()
+        self._connection.close()
+        self._process = None
+        self._connection = None
+
+    def close(self):
+        """Stop the child process"""
+        self._deadline = None
+        if self._process is not None:
+            self._stop()
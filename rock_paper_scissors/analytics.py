@@ -0,0 +1,190 @@
+"""
+Vectorized statistics over a history of rounds, updated incrementally.
+
+MatchStats takes rounds as integer move arrays (see vectorized.py), such as
+the players/computers/outcomes arrays of a matchlog.MatchLogReader, and
+folds each batch into running counts with a few bincount calls, carrying
+the last round and the unfinished streak over to the next batch. Feeding a
+history in any number of batches gives the same statistics as feeding it
+at once, so a dashboard only processes the rounds added since its last
+refresh. It requires NumPy.
+
+Usage:
+    python analytics.py match.log
+"""
+import argparse
+
+import numpy as np
+
+from matchlog import MatchLogReader
+from rules import CLASSIC, VARIANTS, Rules, get_rules, parse_variant
+from vectorized import Tally, resolve_rounds
+
+PLAYER = 0
+COMPUTER = 1
+SIDES = ('player', 'computer')
+# A round's outcome code from the computer's point of view: tie, won, lost
+_COMPUTER_VIEW = np.array([0, 2, 1], dtype=np.intp)
+
+
+def _add(total, counts):
+    """total + counts along the last axis, growing total to fit"""
+    if counts.shape[-1] > total.shape[-1]:
+        total = np.pad(total, [(0, 0)] * (total.ndim - 1) + [(0, counts.shape[-1] - total.shape[-1])])
+    total[..., :counts.shape[-1]] += counts
+    return total
+
+
+class MatchStats:
+    """MatchStats(rules=CLASSIC)
+
+    Running statistics of the rounds passed to update(). Per-side tables are
+    indexed by side (PLAYER or COMPUTER) first:
+
+    - tally: (ties, player wins, computer wins)
+    - transitions[side, previous move, move]: how each side follows its own
+      moves
+    - replies[side, other side's previous move, move]: how each side reacts
+      to the other's last move
+    - responses[side, previous result, shift]: how each side moves after a
+      tie (0), a win (1) or a loss (2) of its own, with shift the distance
+      from its previous move to its next, (move - previous) % size: 0 to
+      stay, 1 to switch to the move that beats the previous one, ...
+    - streak_lengths()[outcome, length]: number of runs of exactly `length`
+      consecutive rounds with the same outcome
+    """
+
+    def __init__(self, rules=CLASSIC):
+        size = rules.size
+        self.rules = rules
+        self.rounds = 0
+        self.tally = np.zeros(3, dtype=np.int64)
+        self.transitions = np.zeros((2, size, size), dtype=np.int64)
+        self.replies = np.zeros((2, size, size), dtype=np.int64)
+        self.responses = np.zeros((2, 3, size), dtype=np.int64)
+        self._streaks = np.zeros((3, 1), dtype=np.int64)  # finished runs only
+        self._last = None   # (moves, outcome) of the latest round
+        self._run = None    # (outcome, length) of the run still going on
+
+    def update(self, players, computers, outcomes=None):
+        """Add rounds given as equal-length arrays of move codes
+
+        outcomes are resolved from the rules if not given.
+        """
+        moves = np.stack([np.asarray(players, dtype=np.intp), np.asarray(computers, dtype=np.intp)])
+        if outcomes is None:
+            outcomes, _ = resolve_rounds(moves[PLAYER], moves[COMPUTER], self.rules)
+        outcomes = np.asarray(outcomes, dtype=np.intp)
+        count = moves.shape[1]
+        if count == 0:
+            return
+        self.tally += np.bincount(outcomes, minlength=3)
+        self._update_sequences(moves, outcomes)
+        self._update_streaks(outcomes)
+        self._last = (moves[:, -1:], outcomes[-1:])
+        self.rounds += count
+
+    def _update_sequences(self, moves, outcomes):
+        # Pair every round with the one before, carried over from the last batch
+        if self._last is None:
+            previous, previous_outcomes = moves[:, :-1], outcomes[:-1]
+            moves = moves[:, 1:]
+        else:
+            previous = np.concatenate([self._last[0], moves[:, :-1]], axis=1)
+            previous_outcomes = np.concatenate([self._last[1], outcomes[:-1]])
+        if moves.shape[1] == 0:
+            return
+        size = self.rules.size
+        side = np.arange(2)[:, None]
+        # One bincount per table, over both sides at once
+        index = (side * size + previous) * size + moves
+        self.transitions += np.bincount(index.ravel(), minlength=2 * size * size).reshape(2, size, size)
+        index = (side * size + previous[::-1]) * size + moves
+        self.replies += np.bincount(index.ravel(), minlength=2 * size * size).reshape(2, size, size)
+        results = np.stack([previous_outcomes, _COMPUTER_VIEW[previous_outcomes]])
+        index = (side * 3 + results) * size + (moves - previous) % size
+        self.responses += np.bincount(index.ravel(), minlength=2 * 3 * size).reshape(2, 3, size)
+
+    def _update_streaks(self, outcomes):
+        starts = np.flatnonzero(outcomes[1:] != outcomes[:-1]) + 1
+        lengths = np.diff(starts, prepend=0, append=len(outcomes))
+        kinds = outcomes[np.concatenate([[0], starts])]
+        if self._run is not None:
+            if self._run[0] == kinds[0]:
+                lengths[0] += self._run[1]
+            else:
+                kinds = np.concatenate([[self._run[0]], kinds])
+                lengths = np.concatenate([[self._run[1]], lengths])
+        self._run = (int(kinds[-1]), int(lengths[-1]))
+        if len(lengths) > 1:
+            self._streaks = _add(self._streaks, self._run_counts(kinds[:-1], lengths[:-1]))
+
+    @staticmethod
+    def _run_counts(kinds, lengths):
+        width = int(lengths.max()) + 1
+        return np.bincount(kinds * width + lengths, minlength=3 * width).reshape(3, width)
+
+    def refresh(self, path):
+        """Add the rounds appended to the match log at path since the last refresh
+
+        The log must only have been fed to this MatchStats, in full.
+        """
+        with MatchLogReader(path) as log:
+            if log.moves != self.rules.size:
+                raise ValueError(f"{path} records a {log.moves}-move game, not {self.rules.size}")
+            rounds = np.asarray(log.rounds[self.rounds:])
+        self.update(rounds >> 5, (rounds >> 2) & 7, rounds & 3)
+
+    def win_rates(self):
+        """Fractions of ties, player wins and computer wins"""
+        return Tally(*(self.tally / max(self.rounds, 1)).tolist())
+
+    def streak_lengths(self):
+        """Runs per outcome and length, counting the run still going on"""
+        if self._run is None:
+            return self._streaks.copy()
+        outcome, length = self._run
+        return _add(self._streaks.copy(), self._run_counts(np.array([outcome]), np.array([length])))
+
+    def longest_streaks(self):
+        """The longest run of ties, player wins and computer wins"""
+        streaks = self.streak_lengths()
+        return Tally(*(int(np.flatnonzero(row)[-1]) if row.any() else 0 for row in streaks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise a match log.")
+    parser.add_argument('log', help="match log written with --log")
+    parser.add_argument('--variant', type=parse_variant,
+                        help="game variant the log was played with, for the move names "
+                             "(default: the named variant with as many moves)")
+    args = parser.parse_args(argv)
+
+    if args.variant:
+        rules = get_rules(args.variant)
+    else:
+        with MatchLogReader(args.log) as log:
+            moves = log.moves
+        rules = next((rules for rules in VARIANTS.values() if rules.size == moves), None)
+        rules = rules or Rules.cyclic(moves)
+    stats = MatchStats(rules)
+    stats.refresh(args.log)
+
+    rates = stats.win_rates()
+    longest = stats.longest_streaks()
+    print(f"{stats.rounds:,} rounds - player {rates.player_wins:.2%}, "
+          f"computer {rates.computer_wins:.2%}, ties {rates.ties:.2%}")
+    print(f"Longest streaks - player wins {longest.player_wins}, "
+          f"computer wins {longest.computer_wins}, ties {longest.ties}")
+    for side, name in enumerate(SIDES):
+        print(f"\n{name} moves after each of its own moves (rows: previous move):")
+        for move, row in zip(rules.moves, stats.transitions[side]):
+            print(f"  {move:<10} " + " ".join(f"{count:>10,}" for count in row))
+        print(f"{name} move shift after a tie / win / loss (columns: shift 0..{rules.size - 1}):")
+        for result, row in zip(('tie', 'win', 'loss'), stats.responses[side]):
+            total = max(int(row.sum()), 1)
+            print(f"  {result:<10} " + " ".join(f"{count / total:>10.1%}" for count in row))
+
+
+if __name__ == "__main__":
+    main()
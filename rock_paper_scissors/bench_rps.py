@@ -0,0 +1,180 @@
+"""
+Throughput benchmarks for the Rock Paper Scissors hot paths.
+
+Usage:
+    python bench_rps.py
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from matchlog import MatchLogReader, MatchLogWriter
+from movegen import MoveGenerator
+from opponent import NGramOpponent
+from rules import CLASSIC
+from session_store import SessionStore
+from script import MOVES, build_prompt, determine_winner, get_computer_choice
+from vectorized import resolve_rounds
+
+
+def _rate(rounds, seconds):
+    return rounds / seconds if seconds else float('inf')
+
+
+def bench_determine_winner(rounds=300_000):
+    """Rounds per second through the scalar string resolver"""
+    rng = np.random.default_rng(0)
+    players = [MOVES[i] for i in rng.integers(0, 3, rounds)]
+    computers = [MOVES[i] for i in rng.integers(0, 3, rounds)]
+    start = time.perf_counter()
+    for player, computer in zip(players, computers):
+        determine_winner(player, computer)
+    return _rate(rounds, time.perf_counter() - start)
+
+
+def bench_resolve_rounds(rounds=20_000_000):
+    """Rounds per second through the vectorized resolver"""
+    rng = np.random.default_rng(0)
+    players = rng.integers(0, 3, rounds, dtype=np.uint8)
+    computers = rng.integers(0, 3, rounds, dtype=np.uint8)
+    start = time.perf_counter()
+    resolve_rounds(players, computers)
+    return _rate(rounds, time.perf_counter() - start)
+
+
+def bench_get_computer_choice(rounds=1_000_000):
+    """Draws per second through the legacy per-call get_computer_choice"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        get_computer_choice()
+    return _rate(rounds, time.perf_counter() - start)
+
+
+def bench_move_generator(rounds=1_000_000):
+    """Draws per second through the block-buffered MoveGenerator"""
+    generator = MoveGenerator(seed=0)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        generator.choice()
+    return _rate(rounds, time.perf_counter() - start)
+
+
+def bench_adaptive_latency(checkpoints=(10**5, 10**6, 10**7), window=50_000):
+    """Mean choose+observe latency (ns) of the n-gram opponent at points of a
+    long session, as a list of (rounds played, latency) pairs"""
+    opponent = NGramOpponent(order=3, seed=0)
+    results = []
+    played = 0
+    for mark in checkpoints:
+        # Fast-forward to the checkpoint, then time one window of rounds.
+        for i in range(played, mark - window):
+            opponent.choose()
+            opponent.observe(i % 3)
+        start = time.perf_counter()
+        for i in range(mark - window, mark):
+            opponent.choose()
+            opponent.observe(i % 3)
+        elapsed = time.perf_counter() - start
+        results.append((mark, elapsed / window * 1e9))
+        played = mark
+    return results
+
+
+def bench_session_store(sessions=1_000_000):
+    """Bytes per session (as allocated) and recorded rounds per second for a
+    store holding `sessions` open sessions"""
+    tracemalloc.start()
+    store = SessionStore()
+    for _ in range(sessions):
+        store.open()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for session_id in range(sessions):
+        store.record(session_id, 0, 2, 1)
+    return allocated / sessions, _rate(sessions, time.perf_counter() - start)
+
+
+def bench_match_log(rounds=50_000_000):
+    """Rounds per second written to, and tallied back from, a match log"""
+    generator = MoveGenerator(seed=0, block_size=1 << 20)
+    players = generator.take(rounds)
+    computers = generator.take(rounds)
+    outcomes, _ = resolve_rounds(players, computers)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.log')
+        start = time.perf_counter()
+        with MatchLogWriter(path, buffer_size=1 << 24) as log:
+            log.extend(players, computers, outcomes)
+        write_rate = _rate(rounds, time.perf_counter() - start)
+        start = time.perf_counter()
+        with MatchLogReader(path) as reader:
+            np.bincount(reader.outcomes, minlength=3)
+        read_rate = _rate(rounds, time.perf_counter() - start)
+    return write_rate, read_rate
+
+
+async def _server_latency(port, idle_clients, active_clients, rounds):
+    prompt = build_prompt(CLASSIC).encode()
+    idle = []
+    for _ in range(idle_clients):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await reader.readuntil(prompt)
+        idle.append(writer)
+
+    async def play():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await reader.readuntil(prompt)
+        latencies = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            writer.write(b"r\n")
+            await reader.readuntil(prompt)
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+        return latencies
+
+    results = await asyncio.gather(*(play() for _ in range(active_clients)))
+    for writer in idle:
+        writer.close()
+    return sorted(latency for latencies in results for latency in latencies)
+
+
+def bench_server_latency(idle_clients=10_000, active_clients=10, rounds=1_000, port=5099):
+    """Median and p99 per-round latency (ms) seen by active clients while
+    idle_clients other sessions stay connected to a server subprocess"""
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(__file__), 'server.py'),
+                               '--port', str(port)],
+                              stdout=subprocess.PIPE)
+    try:
+        server.stdout.readline()  # wait until it is listening
+        latencies = asyncio.run(_server_latency(port, idle_clients, active_clients, rounds))
+    finally:
+        server.terminate()
+        server.wait()
+    return latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * 0.99)] * 1e3
+
+
+def main():
+    print(f"determine_winner: {bench_determine_winner():>14,.0f} rounds/s")
+    print(f"resolve_rounds:   {bench_resolve_rounds():>14,.0f} rounds/s")
+    print(f"get_computer_choice: {bench_get_computer_choice():>11,.0f} draws/s")
+    print(f"MoveGenerator.choice: {bench_move_generator():>10,.0f} draws/s")
+    write_rate, read_rate = bench_match_log()
+    print(f"match log: write {write_rate:,.0f} rounds/s, replay {read_rate:,.0f} rounds/s")
+    per_session, record_rate = bench_session_store()
+    print(f"session store: {per_session:.1f} bytes/session, {record_rate:,.0f} rounds recorded/s")
+    median, p99 = bench_server_latency()
+    print(f"server round @ 10k sessions: median {median:.3f} ms, p99 {p99:.3f} ms")
+    for played, latency in bench_adaptive_latency():
+        print(f"adaptive opponent @ {played:>12,} rounds: {latency:8.0f} ns/round")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Headless Rock Paper Scissors game core.
+
+GameEngine owns a game's rules, opponent and score and plays rounds without
+any UI. Front ends subscribe to it and redraw from its state when notified,
+so the game logic runs (and can be driven at full speed) without Tk.
+"""
+import threading
+from collections import namedtuple
+
+from movegen import MoveGenerator
+from rules import CLASSIC
+
+# Move codes and outcome code (see rules.Rules) of one played round
+Round = namedtuple('Round', ['player', 'computer', 'outcome'])
+
+
+class GameEngine:
+    """GameEngine(rules=CLASSIC, opponent=None)
+
+    opponent is anything with the choose()/observe() interface of
+    opponent.NGramOpponent; by default the computer plays uniformly at random
+    from a MoveGenerator.
+
+    Observers are called as observer(engine) after every play(), after each
+    play_many() batch and after reset(); last_round is None after a reset.
+    lock is held while the state changes, so another thread can read a
+    consistent state under it.
+    """
+
+    def __init__(self, rules=CLASSIC, opponent=None):
+        self.rules = rules
+        self.opponent = opponent or MoveGenerator(rules)
+        self.player_score = 0
+        self.computer_score = 0
+        self.ties = 0
+        self.last_round = None
+        self.lock = threading.Lock()
+        self._observers = []
+
+    @property
+    def rounds(self):
+        return self.player_score + self.computer_score + self.ties
+
+    def subscribe(self, observer):
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer):
+        self._observers.remove(observer)
+
+    def _notify(self):
+        for observer in self._observers:
+            observer(self)
+
+    def _play(self, player):
+        computer = self.opponent.choose()
+        self.opponent.observe(player)
+        outcome = self.rules.resolve(player, computer)
+        if outcome == 1:
+            self.player_score += 1
+        elif outcome == 2:
+            self.computer_score += 1
+        else:
+            self.ties += 1
+        self.last_round = Round(player, computer, outcome)
+        return self.last_round
+
+    def play(self, player):
+        """Play one round with the player's move code and return it"""
+        with self.lock:
+            result = self._play(player)
+        self._notify()
+        return result
+
+    def play_many(self, players):
+        """Play a round for each move code, notifying observers once at the end"""
+        with self.lock:
+            for player in players:
+                self._play(player)
+        self._notify()
+        return self.last_round
+
+    def reset(self):
+        """Zero the score"""
+        with self.lock:
+            self.player_score = 0
+            self.computer_score = 0
+            self.ties = 0
+            self.last_round = None
+        self._notify()
@@ -0,0 +1,134 @@
+"""
+Exploitability of computer strategies, computed exactly from their move
+distributions.
+
+A strategy's empirical mixed strategy (how often it plays each move) is a
+profile. The best response to a profile q is the move i with the highest
+expected payoff (A q)_i, where A is the game's payoff matrix (+1 win, 0 tie,
+-1 loss for the row move). The value of that best response is the
+strategy's exploitability: the balanced cyclic games of rules.py are
+symmetric zero-sum games of value 0, so it is also the profile's NashConv,
+and it is 0 exactly at the unique equilibrium, the uniform profile.
+nash_distance is the total variation distance from that equilibrium.
+
+Conditioning on recent history gives one profile per context (e.g. the
+previous round's moves); a best responder that knows the context earns the
+context-weighted average of the per-context values. Every function here is
+batched: profiles and count tables may have any leading dimensions, so
+thousands of strategies are evaluated in one matrix product. It requires
+NumPy.
+
+Usage:
+    python exploitability.py --rounds 20000 --variant rpsls
+"""
+import argparse
+
+import numpy as np
+
+from movegen import MoveGenerator
+from rules import CLASSIC, VARIANTS, get_rules, parse_variant
+from strategies import STRATEGIES
+
+
+def payoff_matrix(rules=CLASSIC):
+    """A[i, j]: the payoff of playing move i against move j"""
+    outcomes = np.frombuffer(rules.table, dtype=np.uint8).reshape(rules.size, rules.size)
+    return np.choose(outcomes, [0.0, 1.0, -1.0])
+
+
+def _normalize(counts):
+    """Rows of counts as probabilities; all-zero rows become uniform"""
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    uniform = np.full_like(counts, 1 / counts.shape[-1])
+    return np.divide(counts, totals, out=uniform, where=totals > 0)
+
+
+def best_response(profiles, rules=CLASSIC):
+    """(value, move) of the best response to each profile
+
+    profiles has shape (..., size) and holds probabilities or move counts.
+    """
+    payoffs = _normalize(profiles) @ payoff_matrix(rules).T
+    return payoffs.max(axis=-1), payoffs.argmax(axis=-1)
+
+
+def nash_distance(profiles):
+    """Total variation distance from each profile to the uniform equilibrium"""
+    profiles = _normalize(profiles)
+    return 0.5 * np.abs(profiles - 1 / profiles.shape[-1]).sum(axis=-1)
+
+
+def conditional_exploitability(counts, rules=CLASSIC):
+    """Exploitability when the best responder knows the context
+
+    counts has shape (..., contexts, size): the moves a strategy played in
+    each context. Contexts are weighted by how often they occurred.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    values, _ = best_response(counts, rules)
+    weights = counts.sum(axis=-1)
+    totals = weights.sum(axis=-1)
+    return np.divide((values * weights).sum(axis=-1), totals,
+                     out=np.zeros_like(totals), where=totals > 0)
+
+
+def history_counts(moves, opponent_moves, size):
+    """counts[previous opponent move, previous move, move] of a strategy's moves"""
+    moves = np.asarray(moves, dtype=np.intp)
+    context = np.asarray(opponent_moves, dtype=np.intp)[:-1] * size + moves[:-1]
+    index = context * size + moves[1:]
+    return np.bincount(index, minlength=size ** 3).reshape(size * size, size)
+
+
+def sample_strategy(name, rules=CLASSIC, rounds=10_000, seed=0):
+    """A strategy's moves and those of the random player it faced"""
+    strategy = STRATEGIES[name](rules, seed, 1)
+    player = MoveGenerator(rules, seed=seed, stream=0).take(rounds).tolist()
+    moves = []
+    for move in player:
+        moves.append(strategy.choose())
+        strategy.observe(move)
+    return np.array(moves, dtype=np.uint8), np.array(player, dtype=np.uint8)
+
+
+def evaluate_strategies(names, rules=CLASSIC, rounds=10_000, seed=0):
+    """(overall, conditional) exploitability and Nash distance per strategy
+
+    Each strategy plays `rounds` rounds against a random player; all of
+    their profiles are then evaluated in one batch. conditional is the
+    exploitability given the previous round's moves.
+    """
+    size = rules.size
+    overall = np.zeros((len(names), size))
+    conditional = np.zeros((len(names), size * size, size))
+    for i, name in enumerate(names):
+        moves, player = sample_strategy(name, rules, rounds, seed)
+        overall[i] = np.bincount(moves, minlength=size)
+        conditional[i] = history_counts(moves, player, size)
+    values, _ = best_response(overall, rules)
+    return {name: (float(value), float(given_history), float(distance))
+            for name, value, given_history, distance in zip(
+                names, values, conditional_exploitability(conditional, rules), nash_distance(overall))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how exploitable each strategy is.")
+    parser.add_argument('--strategy', dest='names', action='append', choices=STRATEGIES,
+                        help="a strategy to evaluate (repeatable, default: all)")
+    parser.add_argument('--rounds', type=int, default=10_000,
+                        help="rounds sampled from each strategy against a random player")
+    parser.add_argument('--variant', default='classic', type=parse_variant,
+                        help=f"game variant: {', '.join(VARIANTS)} or an odd number of moves")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = evaluate_strategies(args.names or list(STRATEGIES), get_rules(args.variant),
+                                  args.rounds, args.seed)
+    print(f"{'strategy':<10} {'overall':>8} {'given last round':>17} {'Nash distance':>14}")
+    for name, (value, given_history, distance) in results.items():
+        print(f"{name:<10} {value:>8.3f} {given_history:>17.3f} {distance:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Append-only binary log of played rounds.
+
+File layout: an 8-byte header (the magic b'RPSLOG', a format version byte and
+the number of moves in the variant) followed by one byte per round:
+
+    bits 7-5  player move code
+    bits 4-2  computer move code
+    bits 1-0  outcome code (0 tie, 1 player win, 2 computer win)
+
+so variants of up to 8 moves fit. MatchLogWriter buffers rounds and writes
+them in bulk; MatchLogReader memory-maps the file and exposes the rounds as
+a zero-copy NumPy uint8 view, so huge logs can be analysed without turning
+every round into Python objects.
+"""
+import mmap
+import os
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+from rules import CLASSIC
+
+MAGIC = b'RPSLOG'
+VERSION = 1
+HEADER_SIZE = 8
+MAX_MOVES = 8
+
+
+def pack_round(player, computer, outcome):
+    """The log byte for one round"""
+    return player << 5 | computer << 2 | outcome
+
+
+def unpack_round(byte):
+    """(player, computer, outcome) from a log byte"""
+    return byte >> 5, (byte >> 2) & 7, byte & 3
+
+
+def _header(moves):
+    return MAGIC + bytes((VERSION, moves))
+
+
+def _read_header(f, path):
+    header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a match log")
+    if header[len(MAGIC)] != VERSION:
+        raise ValueError(f"{path} has unsupported match log version {header[len(MAGIC)]}")
+    return header[len(MAGIC) + 1]
+
+
+class MatchLogWriter:
+    """MatchLogWriter(path, rules=CLASSIC, buffer_size=65536)
+
+    Appends rounds to the log at path, creating it if needed. Rounds are
+    buffered in memory and written once buffer_size of them have piled up, on
+    flush() and on close(). Appending to an existing log requires the same
+    number of moves as it was created with.
+    """
+
+    def __init__(self, path, rules=CLASSIC, buffer_size=65536):
+        if rules.size > MAX_MOVES:
+            raise ValueError(f"Match logs support at most {MAX_MOVES} moves")
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(path, 'a+b')
+        if self._file.tell() == 0:
+            self._file.write(_header(rules.size))
+        else:
+            self._file.seek(0)
+            moves = _read_header(self._file, path)
+            if moves != rules.size:
+                raise ValueError(f"{path} records a {moves}-move game, not {rules.size}")
+            self._file.seek(0, os.SEEK_END)
+
+    def append(self, player, computer, outcome):
+        """Log one round"""
+        self._buffer.append(player << 5 | computer << 2 | outcome)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def extend(self, players, computers, outcomes):
+        """Log many rounds at once from equal-length arrays of codes"""
+        if np is not None:
+            packed = np.asarray(players, dtype=np.uint8) << 5
+            packed |= np.asarray(computers, dtype=np.uint8) << 2
+            packed |= np.asarray(outcomes, dtype=np.uint8)
+            self._buffer += packed.tobytes()
+        else:
+            self._buffer += bytes(map(pack_round, players, computers, outcomes))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rounds to the file"""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MatchLogReader:
+    """MatchLogReader(path)
+
+    Memory-maps a match log. `rounds` is the packed round bytes: a read-only
+    uint8 NumPy memmap, or a memoryview when NumPy is not installed. The
+    players, computers and outcomes arrays are decoded from it with NumPy
+    and need NumPy installed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.moves = _read_header(f, path)
+            length = os.fstat(f.fileno()).st_size - HEADER_SIZE
+            self._mmap = None
+            if np is not None:
+                if length:
+                    self.rounds = np.memmap(f, dtype=np.uint8, mode='r', offset=HEADER_SIZE)
+                else:
+                    self.rounds = np.empty(0, dtype=np.uint8)
+            else:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.rounds = memoryview(self._mmap)[HEADER_SIZE:]
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def __iter__(self):
+        """(player, computer, outcome) for each round, one at a time"""
+        return map(unpack_round, memoryview(self.rounds))
+
+    @property
+    def players(self):
+        return self.rounds >> 5
+
+    @property
+    def computers(self):
+        return (self.rounds >> 2) & 7
+
+    @property
+    def outcomes(self):
+        return self.rounds & 3
+
+    def close(self):
+        if self._mmap is not None:
+            self.rounds.release()
+            self._mmap.close()
+        self.rounds = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
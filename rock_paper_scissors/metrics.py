@@ -0,0 +1,172 @@
+"""
+Opt-in counters and latency histograms, exposed in Prometheus text format.
+
+Nothing is measured until instrument() wraps a function: instrumented code
+is otherwise untouched, so instrumentation that is not enabled costs
+nothing. Once enabled, metrics can be served over HTTP with serve() and/or
+written out when the program exits with dump_on_exit().
+"""
+import atexit
+import bisect
+import functools
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, from 1 microsecond to 10 seconds
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _series(name, labels, extra=None):
+    pairs = dict(labels, **extra) if extra else labels
+    if not pairs:
+        return name
+    return name + '{' + ','.join(f'{key}="{value}"' for key, value in pairs.items()) + '}'
+
+
+class Counter:
+    """A count that only goes up"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=None):
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        yield _series(self.name, self.labels), self.value
+
+
+class Histogram:
+    """Counts of observed durations per bucket, with their sum"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=None, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels or {}
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last is +Inf
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            yield _series(self.name + '_bucket', self.labels, {'le': le}), cumulative
+        yield _series(self.name + '_sum', self.labels), self.sum
+        yield _series(self.name + '_count', self.labels), cumulative
+
+
+class Registry:
+    """The metrics of a program, by name and labels"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _get(self, cls, name, help, labels, **kwargs):
+        key = (name, tuple(sorted((labels or {}).items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = self._metrics[key] = cls(name, help, labels, **kwargs)
+        return metric
+
+    def counter(self, name, help, labels=None):
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name, help, labels=None, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        described = set()
+        for metric in sorted(self._metrics.values(), key=lambda metric: metric.name):
+            if metric.name not in described:
+                described.add(metric.name)
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{series} {value}" for series, value in metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def timed(function, histogram=None, on_result=None):
+    """
+    function, observing the duration of every call in histogram (if any) and
+    calling on_result(result, *args) after each call
+    """
+    clock = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        result = function(*args, **kwargs)
+        if histogram is not None:
+            histogram.observe(clock() - start)
+        if on_result is not None:
+            on_result(result, *args)
+        return result
+    return wrapper
+
+
+def instrument(owner, attribute, histogram=None, on_result=None):
+    """
+    Replace owner.attribute (a module function or a class's method) with a
+    timed() wrapper, unless it is instrumented already
+    """
+    function = getattr(owner, attribute)
+    if not hasattr(function, '__wrapped__'):
+        setattr(owner, attribute, timed(function, histogram, on_result))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes are not worth a line on stderr each
+
+
+def serve(port, host='127.0.0.1', registry=REGISTRY):
+    """Serve /metrics from a background thread and return the server"""
+    handler = type('Handler', (_Handler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
+
+
+def dump_on_exit(stream=None, registry=REGISTRY):
+    """Write all metrics to stream (stderr by default) when the program exits"""
+    atexit.register(lambda: (stream or sys.stderr).write(registry.render()))
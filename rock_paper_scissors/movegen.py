@@ -0,0 +1,90 @@
+"""
+Block-buffered, seedable generator of computer moves.
+
+Drawing one random.choice per round is dominated by call overhead, so
+MoveGenerator fills a large block of move codes at a time and hands them out
+until the block runs dry. NumPy's Generator is used when NumPy is installed;
+otherwise blocks come from random.Random into an array('B') buffer.
+
+A (seed, stream) pair always yields the same sequence of moves on the same
+backend, however next_move() and take() calls are interleaved, so different
+streams of one seed give independent, reproducible runs.
+"""
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+from rules import CLASSIC
+
+
+class MoveGenerator:
+    """MoveGenerator(rules=CLASSIC, seed=None, stream=0, block_size=65536)
+
+    Draws uniformly random move codes for the given rules. With seed=None
+    the generator is seeded from the OS.
+    """
+
+    def __init__(self, rules=CLASSIC, seed=None, stream=0, block_size=65536):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.rules = rules
+        self.seed = seed
+        self.stream = stream
+        self.block_size = block_size
+        if np is not None:
+            sequence = np.random.SeedSequence(seed, spawn_key=(stream,))
+            self._rng = np.random.Generator(np.random.PCG64(sequence))
+        else:
+            self._rng = random.Random(None if seed is None else f"{seed}/{stream}")
+        self._block = array('B')
+        self._moves = []
+        self._position = block_size  # empty: the first draw fills a block
+
+    def _refill(self):
+        size = self.rules.size
+        if np is not None:
+            self._block = self._rng.integers(0, size, self.block_size, dtype=np.uint8)
+        else:
+            self._block = array('B', self._rng.choices(range(size), k=self.block_size))
+        # Scalar draws index a plain list, which is much faster than the buffer
+        self._moves = self._block.tolist()
+        self._position = 0
+
+    def next_move(self):
+        """The next move code"""
+        if self._position == self.block_size:
+            self._refill()
+        move = self._moves[self._position]
+        self._position += 1
+        return move
+
+    # Opponent interface (see opponent.NGramOpponent); random play has no memory
+    choose = next_move
+
+    def observe(self, player_move):
+        pass
+
+    def choice(self):
+        """The next move as a move name"""
+        return self.rules.moves[self.next_move()]
+
+    def take(self, n):
+        """The next n move codes, as a uint8 NumPy array (array('B') without NumPy)"""
+        parts = []
+        while n > 0:
+            if self._position == self.block_size:
+                self._refill()
+            end = min(self._position + n, self.block_size)
+            parts.append(self._block[self._position:end])
+            n -= end - self._position
+            self._position = end
+        if np is not None:
+            return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint8)
+        result = array('B')
+        for part in parts:
+            result.extend(part)
+        return result
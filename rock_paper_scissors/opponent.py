@@ -0,0 +1,79 @@
+"""
+Adaptive computer opponent.
+
+NGramOpponent predicts the player's next move from the last `order` moves
+(an order-k Markov model) and plays the move that beats the prediction.
+Counts are updated incrementally and the recent history is kept in a
+fixed-size ring buffer, so each round costs O(1) time and the opponent's
+memory never grows with the length of a session.
+"""
+import random
+from array import array
+
+from rules import CLASSIC
+
+
+class NGramOpponent:
+    """NGramOpponent(rules=CLASSIC, order=2, max_count=65535, seed=None)
+
+    Opponents expose two methods: choose() returns the computer's move code
+    for the next round and observe(player_move) records the player's move
+    once the round has been played.
+
+    Counts for a context are halved once one of them reaches max_count, which
+    bounds the table and lets the model follow a player who changes habits.
+    """
+
+    def __init__(self, rules=CLASSIC, order=2, max_count=65535, seed=None):
+        if order < 1:
+            raise ValueError("order must be at least 1")
+        self.rules = rules
+        self.order = order
+        self.max_count = max_count
+        self.random = random.Random(seed)
+        self.contexts = rules.size ** order
+        # One row of per-move counts for each possible history of `order` moves
+        self.counts = array('I', bytes(4 * self.contexts * rules.size))
+        self.history = array('B', bytes(order))  # ring buffer of recent moves
+        self.position = 0  # next slot to overwrite, i.e. the oldest move
+        self.seen = 0  # moves observed so far, capped at order
+        self.context = 0  # history encoded as a base-N number, oldest move first
+
+    def predict(self):
+        """The player's most likely next move code, or None if unknown"""
+        if self.seen < self.order:
+            return None
+        size = self.rules.size
+        start = self.context * size
+        row = self.counts[start:start + size]
+        best = max(row)
+        if best == 0:
+            return None
+        return row.index(best)
+
+    def choose(self):
+        """The computer's move code for the next round"""
+        predicted = self.predict()
+        if predicted is None:
+            return self.random.randrange(self.rules.size)
+        return self.rules.counter(predicted)
+
+    def observe(self, player_move):
+        """Record the player's move for the round just played"""
+        size = self.rules.size
+        if self.seen == self.order:
+            start = self.context * size
+            index = start + player_move
+            count = self.counts[index] + 1
+            self.counts[index] = count
+            if count >= self.max_count:
+                for i in range(start, start + size):
+                    self.counts[i] >>= 1
+        else:
+            self.seen += 1
+
+        # Drop the oldest move from the context and append the new one.
+        oldest = self.history[self.position]
+        self.context = (self.context - oldest * (self.contexts // size)) * size + player_move
+        self.history[self.position] = player_move
+        self.position = (self.position + 1) % self.order
@@ -20,30 +20,70 @@ Rock Paper Scissors GUI Game using Tkinter
 A graphical version of the classic game with score tracking.
 """
 
+import argparse
+import sys
 import tkinter as tk
-import random
+
+import metrics
+import snapshot
+from engine import GameEngine
+from movegen import MoveGenerator
+from opponent import NGramOpponent
+from rules import CLASSIC, VARIANTS, get_rules, parse_variant
+from script import enable_metrics
 
 class RockPaperScissorsGUI:
-    def __init__(self, root):
+    # Button colors per move; moves of other variants fall back to the default
+    BUTTON_COLORS = {
+        'rock': {'bg': '#95a5a6', 'fg': '#2c3e50', 'activebackground': '#bdc3c7'},
+        'paper': {'bg': '#3498db', 'fg': 'black', 'activebackground': '#5dade2'},
+        'scissors': {'bg': '#911339', 'fg': 'black', 'activebackground': '#ec7063'},
+    }
+    DEFAULT_BUTTON_COLORS = {'bg': '#16a085', 'fg': 'black', 'activebackground': '#48c9b0'}
+    
+    # Result messages and their colors, indexed by outcome code (see rules.Rules)
+    RESULT_MESSAGES = ("It's a tie! 🤝", "You win! 🎉", "Computer wins! 🤖")
+    RESULT_COLORS = ('#f39c12', '#27ae60', '#e74c3c')  # orange, green, red
+    
+    # Autoplay plays a batch of rounds per tick and redraws once per batch
+    AUTOPLAY_INTERVAL_MS = 16
+    AUTOPLAY_ROUNDS_PER_TICK = 250
+    
+    def __init__(self, root, rules=CLASSIC, opponent=None):
         self.root = root
         self.root.title("Rock Paper Scissors Game")
         self.root.geometry("500x600")
         self.root.configure(bg='#2c3e50')
         
-        # Game state
-        self.player_score = 0
-        self.computer_score = 0
-        self.choices = ['rock', 'paper', 'scissors']
+        # Game state lives in the headless engine; the window only observes it
+        self.rules = rules
+        self.engine = GameEngine(rules, opponent)
+        self.engine.subscribe(self.schedule_redraw)
+        self.redraw_pending = False
+        self.autoplay_job = None
+        self.autoplay_moves = MoveGenerator(rules)
+        self.choices = list(rules.moves)
+        self.choice_buttons = {}
         
         # Emojis for visual appeal
         self.choice_emojis = {
             'rock': '🪨',
             'paper': '📄', 
-            'scissors': '✂️'
+            'scissors': '✂️',
+            'lizard': '🦎',
+            'spock': '🖖'
         }
         
         self.setup_ui()
     
+    @property
+    def player_score(self):
+        return self.engine.player_score
+    
+    @property
+    def computer_score(self):
+        return self.engine.computer_score
+    
     def setup_ui(self):
         # Main title
         title_label = tk.Label(
@@ -85,38 +125,17 @@ class RockPaperScissorsGUI:
             'bd': 3
         }
         
-        self.rock_btn = tk.Button(
-            buttons_frame,
-            text="🪨 ROCK",
-            command=lambda: self.play_game('rock'),
-            bg='#95a5a6',
-            fg='#2c3e50',
-            activebackground='#bdc3c7',
-            **button_style
-        )
-        self.rock_btn.grid(row=0, column=0, padx=10, pady=5)
-        
-        self.paper_btn = tk.Button(
-            buttons_frame,
-            text="📄 PAPER",
-            command=lambda: self.play_game('paper'),
-            bg='#3498db',
-            fg='black',
-            activebackground='#5dade2',
-            **button_style
-        )
-        self.paper_btn.grid(row=0, column=1, padx=10, pady=5)
-        
-        self.scissors_btn = tk.Button(
-            buttons_frame,
-            text="✂️ SCISSORS",
-            command=lambda: self.play_game('scissors'),
-            bg="#911339",
-            fg='black',
-            activebackground='#ec7063',
-            **button_style
-        )
-        self.scissors_btn.grid(row=0, column=2, padx=10, pady=5)
+        for index, choice in enumerate(self.choices):
+            colors = self.BUTTON_COLORS.get(choice, self.DEFAULT_BUTTON_COLORS)
+            button = tk.Button(
+                buttons_frame,
+                text=f"{self.choice_emojis.get(choice, '❔')} {choice.upper()}",
+                command=lambda c=choice: self.play_game(c),
+                **colors,
+                **button_style
+            )
+            button.grid(row=index // 3, column=index % 3, padx=10, pady=5)
+            self.choice_buttons[choice] = button
         
         # Game result display
         self.result_frame = tk.Frame(self.root, bg='#2c3e50')
@@ -171,6 +190,21 @@ class RockPaperScissorsGUI:
         )
         self.reset_btn.pack(side=tk.LEFT, padx=10)
         
+        self.autoplay_btn = tk.Button(
+            control_frame,
+            text="▶ Autoplay",
+            command=self.toggle_autoplay,
+            font=('Arial', 12, 'bold'),
+            bg='#8e44ad',
+            fg='white',
+            activebackground='#a569bd',
+            padx=20,
+            pady=5,
+            relief='raised',
+            bd=2
+        )
+        self.autoplay_btn.pack(side=tk.LEFT, padx=10)
+        
         self.quit_btn = tk.Button(
             control_frame,
             text="❌ Quit Game",
@@ -187,51 +221,45 @@ class RockPaperScissorsGUI:
         self.quit_btn.pack(side=tk.LEFT, padx=10)
     
     def get_computer_choice(self):
-        """Get random computer choice"""
-        return random.choice(self.choices)
+        """Get the computer choice from the engine's opponent"""
+        return self.choices[self.engine.opponent.choose()]
     
     def determine_winner(self, player, computer):
         """Determine the winner of the round"""
-        if player == computer:
-            return "It's a tie! 🤝"
-        elif ((player == 'rock' and computer == 'scissors') or
-              (player == 'paper' and computer == 'rock') or
-              (player == 'scissors' and computer == 'paper')):
-            return "You win! 🎉"
-        else:
-            return "Computer wins! 🤖"
+        codes = self.rules.codes
+        return self.RESULT_MESSAGES[self.rules.resolve(codes[player], codes[computer])]
     
     def play_game(self, player_choice):
-        """Main game logic when player makes a choice"""
-        computer_choice = self.get_computer_choice()
-        
-        # Display choices
-        player_emoji = self.choice_emojis[player_choice]
-        computer_emoji = self.choice_emojis[computer_choice]
-        
-        self.choices_label.config(text=f"You chose: {player_choice.title()}")
-        self.vs_label.config(text=f"{player_emoji} VS {computer_emoji}")
-        
-        # Determine winner
-        result = self.determine_winner(player_choice, computer_choice)
-        
-        # Update scores
-        if "You win" in result:
-            self.player_score += 1
-            self.result_label.config(fg='#27ae60')  # Green for win
-        elif "Computer wins" in result:
-            self.computer_score += 1
-            self.result_label.config(fg='#e74c3c')  # Red for loss
-        else:
-            self.result_label.config(fg='#f39c12')  # Orange for tie
-        
-        # Update display
-        self.result_label.config(text=result)
+        """Play a round with the player's choice; the display follows on idle"""
+        return self.engine.play(self.rules.codes[player_choice])
+    
+    def schedule_redraw(self, engine=None):
+        """Engine observer: coalesce any number of changes into one redraw"""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.redraw)
+    
+    def redraw(self):
+        """Bring every widget up to date with the engine in one pass"""
+        self.redraw_pending = False
         self.update_score_display()
+        last_round = self.engine.last_round
+        if last_round is None:
+            self.choices_label.config(text="Make your choice!")
+            self.vs_label.config(text="")
+            self.result_label.config(text="Game Reset! Good luck! 🍀", fg='#3498db')
+            return
         
-        # Add computer choice info
-        computer_text = f"Computer chose: {computer_choice.title()}"
+        player_choice = self.choices[last_round.player]
+        computer_choice = self.choices[last_round.computer]
+        player_emoji = self.choice_emojis.get(player_choice, '❔')
+        computer_emoji = self.choice_emojis.get(computer_choice, '❔')
         self.choices_label.config(text=f"You: {player_choice.title()} | Computer: {computer_choice.title()}")
+        self.vs_label.config(text=f"{player_emoji} VS {computer_emoji}")
+        self.result_label.config(
+            text=self.RESULT_MESSAGES[last_round.outcome],
+            fg=self.RESULT_COLORS[last_round.outcome]
+        )
     
     def update_score_display(self):
         """Update the score display"""
@@ -241,19 +269,40 @@ class RockPaperScissorsGUI:
     
     def reset_game(self):
         """Reset the game scores and display"""
-        self.player_score = 0
-        self.computer_score = 0
-        self.update_score_display()
-        
-        # Clear result displays
-        self.choices_label.config(text="Make your choice!")
-        self.vs_label.config(text="")
-        self.result_label.config(text="Game Reset! Good luck! 🍀", fg='#3498db')
+        self.engine.reset()
+    
+    def toggle_autoplay(self):
+        """Start or stop playing random moves as fast as the window allows"""
+        if self.autoplay_job is None:
+            self.autoplay_btn.config(text="⏸ Stop")
+            self.autoplay_tick()
+        else:
+            self.root.after_cancel(self.autoplay_job)
+            self.autoplay_job = None
+            self.autoplay_btn.config(text="▶ Autoplay")
+    
+    def autoplay_tick(self):
+        """Play one batch of rounds, then yield to the event loop until the next tick"""
+        self.engine.play_many(self.autoplay_moves.take(self.AUTOPLAY_ROUNDS_PER_TICK).tolist())
+        self.autoplay_job = self.root.after(self.AUTOPLAY_INTERVAL_MS, self.autoplay_tick)
 
-def main():
-    """Run the GUI application"""
+def main(rules=CLASSIC, opponent=None, autoplay=False, snapshot_path=None):
+    """Run the GUI application, resumed from and saved to snapshot_path if given"""
     root = tk.Tk()
-    game = RockPaperScissorsGUI(root)
+    game = RockPaperScissorsGUI(root, rules, opponent)
+    snapshotter = None
+    if snapshot_path is not None:
+        data = snapshot.read(snapshot_path)
+        if data is not None:
+            try:
+                snapshot.restore(game.engine, data)
+            except ValueError as error:
+                root.destroy()
+                sys.exit(f"Cannot resume {snapshot_path}: {error}")
+            game.schedule_redraw()
+        snapshotter = snapshot.Snapshotter(game.engine, snapshot_path).start()
+    if autoplay:
+        game.toggle_autoplay()
     
     # Center the window on screen
     root.update_idletasks()
@@ -261,7 +310,33 @@ def main():
     y = (root.winfo_screenheight() // 2) - (root.winfo_height() // 2)
     root.geometry(f"+{x}+{y}")
     
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        if snapshotter is not None:
+            snapshotter.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Rock Paper Scissors GUI game.")
+    parser.add_argument('--variant', default='classic', type=parse_variant,
+                        help=f"game variant: {', '.join(VARIANTS)} or an odd number of moves (default: classic)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="play against an opponent that learns from your move history")
+    parser.add_argument('--order', type=int, default=2,
+                        help="number of past moves the adaptive opponent looks at (default: 2)")
+    parser.add_argument('--autoplay', action='store_true',
+                        help="start with autoplay on, as a stress test")
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help="resume the session saved in PATH, if any, and keep saving it there")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve metrics in Prometheus text format on localhost:PORT")
+    parser.add_argument('--metrics-dump', action='store_true',
+                        help="write the metrics to stderr on exit")
+    args = parser.parse_args()
+    if args.metrics_port is not None or args.metrics_dump:
+        enable_metrics(args.metrics_port, args.metrics_dump)
+        metrics.instrument(RockPaperScissorsGUI, 'play_game', metrics.REGISTRY.histogram(
+            'rps_play_game_seconds', "Time to play a round from a button press, before the redraw"))
+    rules = get_rules(args.variant)
+    main(rules, NGramOpponent(rules, order=args.order) if args.adaptive else None, args.autoplay,
+         args.snapshot)
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Shared game rules for Rock Paper Scissors and its odd-N cyclic variants.
+
+Moves are interned as small ints (their index in Rules.moves) and every
+pairing is precomputed into a flat outcome table, so resolving a round is a
+single table lookup regardless of how many moves the variant has.
+
+Outcome codes are 0 for a tie, 1 when the player wins and 2 when the
+computer wins, matching the order of script.OUTCOMES.
+
+Move codes are stored as bytes throughout (NumPy uint8 move blocks, byte
+arrays of moves and signed bytes where -1 means "no move"), so a game has
+at most MAX_MOVES moves.
+"""
+import argparse
+
+MAX_MOVES = 127
+
+
+class Rules:
+    """Rules(moves, aliases=None)
+
+    A balanced cyclic game: with n (odd) moves listed in order, every move
+    beats the n // 2 moves immediately before it (wrapping around) and loses
+    to the n // 2 moves after it.
+
+    aliases maps extra input spellings (e.g. 'r') to move names; every move
+    name is always accepted as its own alias.
+    """
+
+    def __init__(self, moves, aliases=None):
+        if len(moves) < 3 or len(moves) % 2 == 0:
+            raise ValueError("A cyclic game needs an odd number of moves (at least 3)")
+        if len(moves) > MAX_MOVES:
+            raise ValueError(f"A cyclic game can have at most {MAX_MOVES} moves")
+        if len(set(moves)) != len(moves):
+            raise ValueError("Move names must be unique")
+        self.moves = tuple(moves)
+        self.size = len(self.moves)
+        self.codes = {move: code for code, move in enumerate(self.moves)}
+        self.aliases = dict(self.codes)
+        for alias, move in (aliases or {}).items():
+            self.aliases[alias] = self.codes[move]
+        self.table = bytes(self._outcome(player, computer)
+                           for player in range(self.size)
+                           for computer in range(self.size))
+        # Same outcomes keyed by name pairs, for callers holding move strings.
+        self.outcomes_by_name = {(p, c): self.table[i * self.size + j]
+                                 for i, p in enumerate(self.moves)
+                                 for j, c in enumerate(self.moves)}
+
+    @classmethod
+    def cyclic(cls, n, names=None):
+        """Build an n-move cyclic game, naming moves 'move0'... by default
+
+        Each move can also be entered by its number.
+        """
+        names = names or [f"move{i}" for i in range(n)]
+        return cls(names, aliases={str(i): name for i, name in enumerate(names)})
+
+    def _outcome(self, player, computer):
+        difference = (player - computer) % self.size
+        if difference == 0:
+            return 0
+        return 1 if difference <= self.size // 2 else 2
+
+    def resolve(self, player, computer):
+        """Outcome code for a round given the two move codes"""
+        return self.table[player * self.size + computer]
+
+    def counter(self, move):
+        """A move code that beats the given move code"""
+        return (move + 1) % self.size
+
+    def short_aliases(self, move):
+        """The aliases of a move other than its own name"""
+        code = self.codes[move]
+        return [alias for alias, c in self.aliases.items() if c == code and alias != move]
+
+
+CLASSIC = Rules(
+    ('rock', 'paper', 'scissors'),
+    aliases={'r': 'rock', 'p': 'paper', 's': 'scissors'},
+)
+
+# Ordered so that each move beats the two before it:
+# rock crushes scissors and lizard, spock smashes scissors and vaporizes rock, ...
+LIZARD_SPOCK = Rules(
+    ('rock', 'spock', 'paper', 'lizard', 'scissors'),
+    aliases={'r': 'rock', 'sp': 'spock', 'p': 'paper', 'l': 'lizard', 's': 'scissors'},
+)
+
+VARIANTS = {
+    'classic': CLASSIC,
+    'rpsls': LIZARD_SPOCK,
+}
+
+
+def get_rules(variant):
+    """Look up a named variant, or build an N-move cyclic game from a number"""
+    if variant in VARIANTS:
+        return VARIANTS[variant]
+    if str(variant).isdigit():
+        return Rules.cyclic(int(variant))
+    raise ValueError(f"Unknown variant: {variant}")
+
+
+def parse_variant(text):
+    """argparse type for --variant: the variant itself if get_rules accepts
+    it, a usage error otherwise"""
+    try:
+        get_rules(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+    return text
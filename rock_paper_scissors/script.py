@@ -1,7 +1,26 @@
+import argparse
 import random
+import sys
+from array import array
+from collections import Counter
 
-def get_computer_choice():
-    choices = ['rock', 'paper', 'scissors']
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+import metrics
+import snapshot
+from engine import GameEngine
+from matchlog import MAX_MOVES as MAX_LOG_MOVES, MatchLogWriter
+from movegen import MoveGenerator
+from opponent import NGramOpponent
+from rules import CLASSIC, VARIANTS, Rules, get_rules, parse_variant
+
+def get_computer_choice(rules=CLASSIC):
+    # The original one-call-per-round draw; the game loops use a
+    # MoveGenerator so rounds come from pre-filled blocks.
+    choices = list(rules.moves)
     return random.choice(choices)
 
 # Define constants for result values
@@ -9,52 +28,255 @@ TIE = "tie"
 PLAYER_WIN = "player_win"
 COMPUTER_WIN = "computer_win"
 
-def determine_winner(player, computer):
+# Integer encodings used by the batch APIs: a move is its index in MOVES and
+# an outcome is its index in OUTCOMES (see rules.Rules for the lookup table).
+MOVES = CLASSIC.moves
+OUTCOMES = (TIE, PLAYER_WIN, COMPUTER_WIN)
+
+RESULT_MESSAGES = {
+    PLAYER_WIN: "You win!",
+    COMPUTER_WIN: "Computer wins!",
+    TIE: "It's a tie!",
+}
+INVALID_MESSAGE = "Invalid choice. Please try again."
+GOODBYE_MESSAGE = "Thanks for playing!"
+
+def determine_winner(player, computer, rules=CLASSIC):
     if player == computer:
         return TIE
-    elif (player == 'rock' and computer == 'scissors') or \
-         (player == 'paper' and computer == 'rock') or \
-         (player == 'scissors' and computer == 'paper'):
-        return PLAYER_WIN
-    else:
+    outcome = rules.outcomes_by_name.get((player, computer))
+    if outcome is None:
         return COMPUTER_WIN
-    
-def main():
-    player_score = 0
-    computer_score = 0
-    input_map = {
-        'rock': 'rock', 'r': 'rock',
-        'paper': 'paper', 'p': 'paper',
-        'scissors': 'scissors', 's': 'scissors'
-    }
-    
+    return OUTCOMES[outcome]
+
+def build_prompt(rules):
+    options = []
+    for move in rules.moves:
+        aliases = rules.short_aliases(move)
+        options.append(f"{move} ({'/'.join(aliases)})" if aliases else move)
+    return f"Enter {', '.join(options)} or quit to exit: "
+
+def format_round(computer_choice, result, player_score, computer_score):
+    # The text shown after each round, shared by the CLI and the TCP server
+    return (f"Computer chose: {computer_choice}\n"
+            f"{RESULT_MESSAGES[result]}\n"
+            f"Score - You: {player_score}, Computer: {computer_score}\n"
+            + "-" * 20)
+
+def main(rules=CLASSIC, opponent=None, log=None, engine=None):
+    # engine, if given, is a session to continue (e.g. restored from a
+    # snapshot) and takes the place of rules and opponent
+    if engine is None:
+        engine = GameEngine(rules, opponent)
+    rules = engine.rules
+    input_map = rules.aliases
+    prompt = build_prompt(rules)
+
     while True:
-        player_input = input("Enter rock (r), paper (p), scissors (s) or quit to exit: ").lower().strip()
+        player_input = input(prompt).lower().strip()
         # The input is converted to lowercase above, so the check below is case-insensitive.
         if player_input == 'quit':
-            print("Thanks for playing!")
+            print(GOODBYE_MESSAGE)
             break
         if player_input not in input_map:
-            print("Invalid choice. Please try again.")
+            print(INVALID_MESSAGE)
             continue
-        
-        player = input_map[player_input]
-        computer = get_computer_choice()
-        print(f"Computer chose: {computer}")
-        
-        result = determine_winner(player, computer)
+
+        player, computer, outcome = engine.play(input_map[player_input])
+        if log is not None:
+            log.append(player, computer, outcome)
         # Print a user-friendly message
-        if result == PLAYER_WIN:
-            print("You win!")
-            player_score += 1
-        elif result == COMPUTER_WIN:
-            print("Computer wins!")
-            computer_score += 1
+        print(format_round(rules.moves[computer], OUTCOMES[outcome],
+                           engine.player_score, engine.computer_score))
+
+BATCH_CHUNK_SIZE = 65536
+BATCH_READ_SIZE = 65536
+
+def _play_chunk(players, opponent, rules, out, log, lines):
+    # Resolve a chunk of player move codes and write its result lines in one go;
+    # returns the chunk's (ties, player wins, computer wins) counts
+    size = rules.size
+    if isinstance(opponent, MoveGenerator):
+        computers = opponent.take(len(players))
+    else:
+        computers = array('B')
+        for player in players:
+            computers.append(opponent.choose())
+            opponent.observe(player)
+    if np is not None:
+        pairs = np.frombuffer(players, dtype=np.uint8).astype(np.intp) * size
+        pairs += np.asarray(computers, dtype=np.intp)
+        pair_counts = enumerate(np.bincount(pairs, minlength=size * size).tolist())
+        pairs = pairs.tolist()
+    else:
+        pairs = [p * size + c for p, c in zip(players, computers)]
+        pair_counts = Counter(pairs).items()
+    counts = [0, 0, 0]
+    for pair, count in pair_counts:
+        counts[rules.table[pair]] += count
+    if log is not None:
+        log.extend(players, computers, [rules.table[pair] for pair in pairs])
+    if lines is not None:
+        out.write("".join([lines[pair] for pair in pairs]))
+    return counts
+
+def _batch_lines(rules):
+    # The result line for every (player, computer) pair, by pair index
+    lines = []
+    for player in rules.moves:
+        for computer in rules.moves:
+            outcome = rules.outcomes_by_name[player, computer]
+            lines.append(f"{player}\t{computer}\t{OUTCOMES[outcome]}\n")
+    return lines
+
+def _read_moves(stream, input_map, invalid, err, block_size=BATCH_READ_SIZE):
+    # Yield move codes until EOF or 'quit', counting bad tokens in invalid[0].
+    # The stream is read in blocks rather than lines, so one huge line is
+    # never held in memory; a token cut off at the end of a block is carried
+    # over to the next one.
+    line_number = 1
+    carried = ''
+    while True:
+        block = stream.read(block_size)
+        text = carried + block
+        carried = ''
+        if block and not text[-1:].isspace():
+            carried = text.rsplit(None, 1)[-1]
+            text = text[:len(text) - len(carried)]
+        lines = text.lower().split('\n')
+        for offset, line in enumerate(lines):
+            for token in line.split():
+                code = input_map.get(token)
+                if code is not None:
+                    yield code
+                elif token == 'quit':
+                    return
+                else:
+                    invalid[0] += 1
+                    err.write(f"line {line_number + offset}: invalid choice {token!r}\n")
+        line_number += len(lines) - 1
+        if not block:
+            return
+
+def run_batch(stream, out, rules=CLASSIC, opponent=None, log=None, summary_only=False,
+              chunk_size=BATCH_CHUNK_SIZE, err=sys.stderr):
+    """Play every move read from stream without prompting
+
+    Moves are whitespace-separated, accepted in the same spellings as the
+    interactive game, and resolved chunk_size at a time, so memory use does
+    not depend on the length of the input. Unless summary_only is set, one
+    tab-separated "player computer result" line is written per round; the
+    final tally always follows. Invalid moves are reported to err and
+    skipped, and a 'quit' move ends the batch early.
+
+    Returns the (ties, player wins, computer wins) counts.
+    """
+    if opponent is None:
+        opponent = MoveGenerator(rules)
+    lines = None if summary_only else _batch_lines(rules)
+    invalid = [0]
+    players = array('B')
+    counts = [0, 0, 0]
+    for code in _read_moves(stream, rules.aliases, invalid, err):
+        players.append(code)
+        if len(players) == chunk_size:
+            counts = [a + b for a, b in zip(counts, _play_chunk(players, opponent, rules, out, log, lines))]
+            players = array('B')
+    if players:
+        counts = [a + b for a, b in zip(counts, _play_chunk(players, opponent, rules, out, log, lines))]
+
+    ties, player_score, computer_score = counts
+    out.write(f"Rounds: {sum(counts)}, Ties: {ties}, Invalid: {invalid[0]}\n")
+    out.write(f"Score - You: {player_score}, Computer: {computer_score}\n")
+    return tuple(counts)
+
+def enable_metrics(port=None, dump=False):
+    """Measure round resolution, serving the metrics over HTTP on port and/or
+    writing them to stderr at exit (see metrics.py)"""
+    registry = metrics.REGISTRY
+    rounds = [registry.counter('rps_rounds_total', "Rounds resolved, by result", {'result': result})
+              for result in OUTCOMES]
+    metrics.instrument(Rules, 'resolve',
+                       registry.histogram('rps_resolve_seconds', "Time to resolve one round"),
+                       lambda outcome, *args: rounds[outcome].inc())
+    # A batch chunk returns its own per-outcome counts
+    def count_chunk(counts, *args):
+        for outcome, count in enumerate(counts):
+            rounds[outcome].inc(count)
+
+    metrics.instrument(sys.modules[__name__], '_play_chunk',
+                       registry.histogram('rps_batch_chunk_seconds', "Time to play one chunk of --batch moves"),
+                       count_chunk)
+    if port is not None:
+        metrics.serve(port)
+    if dump:
+        metrics.dump_on_exit()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Play Rock Paper Scissors against the computer.")
+    parser.add_argument('--variant', default='classic', type=parse_variant,
+                        help=f"game variant: {', '.join(VARIANTS)} or an odd number of moves (default: classic)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="play against an opponent that learns from your move history")
+    parser.add_argument('--order', type=int, default=2,
+                        help="number of past moves the adaptive opponent looks at (default: 2)")
+    parser.add_argument('--seed', type=int,
+                        help="seed for the computer's random moves, for reproducible games")
+    parser.add_argument('--log', metavar='PATH',
+                        help="append every round to a binary match log (see matchlog.py)")
+    parser.add_argument('--batch', metavar='FILE', nargs='?', const='-',
+                        help="play the moves in FILE (or stdin) without prompting")
+    parser.add_argument('--summary', action='store_true',
+                        help="with --batch, print only the final tally")
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help="resume the session saved in PATH, if any, and keep saving it there")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="serve metrics in Prometheus text format on localhost:PORT")
+    parser.add_argument('--metrics-dump', action='store_true',
+                        help="write the metrics to stderr on exit")
+    args = parser.parse_args(argv)
+    if args.log and get_rules(args.variant).size > MAX_LOG_MOVES:
+        parser.error(f"--log supports variants of at most {MAX_LOG_MOVES} moves")
+    return args
+
+def play_session(rules, opponent, log=None, snapshot_path=None):
+    """The interactive game, resumed from and saved to snapshot_path if given"""
+    engine = GameEngine(rules, opponent)
+    if snapshot_path is None:
+        return main(log=log, engine=engine)
+    data = snapshot.read(snapshot_path)
+    if data is not None:
+        try:
+            snapshot.restore(engine, data)
+        except ValueError as error:
+            sys.exit(f"Cannot resume {snapshot_path}: {error}")
+        print(f"Resumed - You: {engine.player_score}, Computer: {engine.computer_score}")
+    snapshotter = snapshot.Snapshotter(engine, snapshot_path).start()
+    try:
+        main(log=log, engine=engine)
+    finally:
+        snapshotter.close()
+
+def run(args):
+    if args.metrics_port is not None or args.metrics_dump:
+        enable_metrics(args.metrics_port, args.metrics_dump)
+    rules = get_rules(args.variant)
+    if args.adaptive:
+        opponent = NGramOpponent(rules, order=args.order, seed=args.seed)
+    else:
+        opponent = MoveGenerator(rules, seed=args.seed)
+    log = MatchLogWriter(args.log, rules) if args.log else None
+    try:
+        if args.batch is None:
+            play_session(rules, opponent, log, args.snapshot)
+        elif args.batch == '-':
+            run_batch(sys.stdin, sys.stdout, rules, opponent, log, args.summary)
         else:
-            print("It's a tie!")
-        
-        print(f"Score - You: {player_score}, Computer: {computer_score}")
-        print("-" * 20)
+            with open(args.batch) as stream:
+                run_batch(stream, sys.stdout, rules, opponent, log, args.summary)
+    finally:
+        if log is not None:
+            log.close()
 
 if __name__ == "__main__":
-    main()
+    run(parse_args())
@@ -0,0 +1,127 @@
+"""
+Multi-session Rock Paper Scissors server.
+
+Serves the same line protocol as the command-line game (script.main) over
+TCP: the server sends the prompt, the client answers with a move or 'quit',
+and the server replies with the round result and the session's score. All
+sessions run on one asyncio event loop, each with its own score.
+
+Usage:
+    python server.py --port 5050
+    nc localhost 5050
+"""
+import argparse
+import asyncio
+
+from movegen import MoveGenerator
+from rules import CLASSIC, VARIANTS, get_rules, parse_variant
+from script import GOODBYE_MESSAGE, INVALID_MESSAGE, OUTCOMES, build_prompt, format_round
+from session_store import SessionStore
+
+DEFAULT_PORT = 5050
+
+
+async def _skip_line(reader):
+    """Discard input up to and including the next newline, or to EOF"""
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as error:
+            await reader.readexactly(error.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class GameServer:
+    """GameServer(rules=CLASSIC, generator=None)
+
+    Holds what the sessions share: the rules, one move generator and the
+    store holding every session's score. Sharing is safe because all
+    sessions run on the same event loop thread.
+    """
+
+    def __init__(self, rules=CLASSIC, generator=None):
+        self.rules = rules
+        self.generator = generator or MoveGenerator(rules)
+        self.store = SessionStore()
+        self.prompt = build_prompt(rules).encode()
+
+    async def handle_session(self, reader, writer):
+        """Play one client's game until it quits or disconnects"""
+        rules = self.rules
+        input_map = rules.aliases
+        store = self.store
+        session_id = store.open().id
+        try:
+            writer.write(self.prompt)
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial  # the last line, cut off by EOF
+                except asyncio.LimitOverrunError:
+                    # Far too long to be a move: skip it without buffering it
+                    await _skip_line(reader)
+                    line = b'\n'
+                if not line:
+                    break
+                player_input = line.decode(errors='replace').lower().strip()
+                if player_input == 'quit':
+                    writer.write(f"{GOODBYE_MESSAGE}\n".encode())
+                    await writer.drain()
+                    break
+                if player_input not in input_map:
+                    writer.write(f"{INVALID_MESSAGE}\n".encode() + self.prompt)
+                    await writer.drain()
+                    continue
+
+                player = input_map[player_input]
+                computer = self.generator.next_move()
+                outcome = rules.resolve(player, computer)
+                store.record(session_id, player, computer, outcome)
+                report = format_round(rules.moves[computer], OUTCOMES[outcome],
+                                      store.player_scores[session_id],
+                                      store.computer_scores[session_id])
+                # One write per round: the result and the next prompt together
+                writer.write(f"{report}\n".encode() + self.prompt)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            store.close(session_id)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT, **kwargs):
+        """Start listening and return the asyncio.Server"""
+        return await asyncio.start_server(self.handle_session, host, port,
+                                          backlog=4096, **kwargs)
+
+
+async def serve(host, port, rules):
+    server = await GameServer(rules).start(host, port)
+    addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving Rock Paper Scissors on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Rock Paper Scissors games over TCP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--variant', default='classic', type=parse_variant,
+                        help=f"game variant: {', '.join(VARIANTS)} or an odd number of moves")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, get_rules(args.variant)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Compact storage for the state of many concurrent game sessions.
+
+Rather than one object per session, SessionStore keeps every field in its
+own contiguous typed array indexed by session ID: scores and round counts as
+unsigned 32-bit ints and the last moves as signed bytes, which hold every
+move code since games have at most rules.MAX_MOVES moves. A session costs
+about 15 bytes, and the slots of closed sessions are reused by new ones.
+
+Session objects are lightweight __slots__ handles onto a row of the store;
+they can be created and dropped freely without affecting the stored state.
+"""
+from array import array
+
+NO_MOVE = -1
+
+
+class Session:
+    """A view of one session's row in a SessionStore"""
+
+    __slots__ = ('store', 'id')
+
+    def __init__(self, store, session_id):
+        self.store = store
+        self.id = session_id
+
+    @property
+    def player_score(self):
+        return self.store.player_scores[self.id]
+
+    @property
+    def computer_score(self):
+        return self.store.computer_scores[self.id]
+
+    @property
+    def rounds(self):
+        return self.store.rounds[self.id]
+
+    @property
+    def last_player_move(self):
+        return self.store.last_player_moves[self.id]
+
+    @property
+    def last_computer_move(self):
+        return self.store.last_computer_moves[self.id]
+
+    def record(self, player_move, computer_move, outcome):
+        self.store.record(self.id, player_move, computer_move, outcome)
+
+    def close(self):
+        self.store.close(self.id)
+
+    def __repr__(self):
+        return (f"Session(id={self.id}, player_score={self.player_score}, "
+                f"computer_score={self.computer_score}, rounds={self.rounds})")
+
+
+class SessionStore:
+    """SessionStore()
+
+    Scores, round counts and last moves for any number of sessions, kept in
+    parallel arrays. Move codes are those of rules.Rules and outcomes use its
+    outcome codes (1 player win, 2 computer win); last moves are NO_MOVE
+    until the session's first round.
+    """
+
+    def __init__(self):
+        self.player_scores = array('I')
+        self.computer_scores = array('I')
+        self.rounds = array('I')
+        self.last_player_moves = array('b')
+        self.last_computer_moves = array('b')
+        self.active = bytearray()
+        self.free = array('I')  # IDs of closed sessions, reused first
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def open(self):
+        """Start a new session and return its handle"""
+        if self.free:
+            session_id = self.free.pop()
+            self.player_scores[session_id] = 0
+            self.computer_scores[session_id] = 0
+            self.rounds[session_id] = 0
+            self.last_player_moves[session_id] = NO_MOVE
+            self.last_computer_moves[session_id] = NO_MOVE
+            self.active[session_id] = 1
+        else:
+            session_id = len(self.active)
+            self.player_scores.append(0)
+            self.computer_scores.append(0)
+            self.rounds.append(0)
+            self.last_player_moves.append(NO_MOVE)
+            self.last_computer_moves.append(NO_MOVE)
+            self.active.append(1)
+        self._count += 1
+        return Session(self, session_id)
+
+    def get(self, session_id):
+        """The handle of an open session"""
+        if not 0 <= session_id < len(self.active) or not self.active[session_id]:
+            raise KeyError(session_id)
+        return Session(self, session_id)
+
+    def close(self, session_id):
+        """End a session and make its slot available for reuse"""
+        if not self.active[session_id]:
+            raise KeyError(session_id)
+        self.active[session_id] = 0
+        self.free.append(session_id)
+        self._count -= 1
+
+    def record(self, session_id, player_move, computer_move, outcome):
+        """Apply one played round to a session"""
+        if outcome == 1:
+            self.player_scores[session_id] += 1
+        elif outcome == 2:
+            self.computer_scores[session_id] += 1
+        self.rounds[session_id] += 1
+        self.last_player_moves[session_id] = player_move
+        self.last_computer_moves[session_id] = computer_move
+
+    @property
+    def nbytes(self):
+        """Bytes held by the store's buffers"""
+        buffers = (self.player_scores, self.computer_scores, self.rounds,
+                   self.last_player_moves, self.last_computer_moves, self.free)
+        return sum(len(a) * a.itemsize for a in buffers) + len(self.active)
@@ -0,0 +1,129 @@
+"""
+Multi-core Monte Carlo match simulator.
+
+Plays large numbers of rounds between pairs of strategies and reports the
+score tallies. The rounds of each pairing are cut into fixed-size shards and
+every shard seeds its strategies from (seed, shard), so the merged totals for
+a given seed are identical however many worker processes run the shards.
+
+Strategies hold no state across shards: an adaptive strategy starts learning
+afresh at the beginning of each shard.
+
+Usage:
+    python simulate.py --rounds 10000000 --pair random:adaptive --workers 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+from rules import VARIANTS, get_rules, parse_variant
+from strategies import STRATEGIES
+
+if np is not None:
+    from vectorized import resolve_rounds
+
+DEFAULT_SHARD_SIZE = 1_000_000
+
+
+def play_shard(variant, player_name, computer_name, rounds, seed, shard):
+    """Play one shard of a pairing and return its (ties, wins, losses) counts
+
+    Player and computer draw from streams 2 * shard and 2 * shard + 1.
+    """
+    rules = get_rules(variant)
+    player = STRATEGIES[player_name](rules, seed, 2 * shard)
+    computer = STRATEGIES[computer_name](rules, seed, 2 * shard + 1)
+    if np is not None and player_name == computer_name == 'random':
+        return tuple(resolve_rounds(player.take(rounds), computer.take(rounds), rules)[1])
+
+    counts = [0, 0, 0]
+    table = rules.table
+    size = rules.size
+    for _ in range(rounds):
+        player_move = player.choose()
+        computer_move = computer.choose()
+        counts[table[player_move * size + computer_move]] += 1
+        player.observe(computer_move)
+        computer.observe(player_move)
+    return tuple(counts)
+
+
+def _play_task(task):
+    return play_shard(*task)
+
+
+def simulate(pairs, rounds, variant='classic', seed=0, workers=None,
+             shard_size=DEFAULT_SHARD_SIZE):
+    """Simulate `rounds` rounds for every (player, computer) strategy pair
+
+    Returns a dict mapping each pair to its merged (ties, wins, losses).
+    workers=1 plays every shard in this process.
+    """
+    for pair in pairs:
+        for name in pair:
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown strategy: {name}")
+    tasks = []
+    for pair in pairs:
+        for shard, start in enumerate(range(0, rounds, shard_size)):
+            tasks.append((variant, pair[0], pair[1], min(shard_size, rounds - start), seed, shard))
+
+    if workers == 1:
+        return _merge(pairs, tasks, map(_play_task, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _merge(pairs, tasks, executor.map(_play_task, tasks))
+
+
+def _merge(pairs, tasks, results):
+    totals = {tuple(pair): [0, 0, 0] for pair in pairs}
+    for task, counts in zip(tasks, results):
+        total = totals[task[1], task[2]]
+        for i, count in enumerate(counts):
+            total[i] += count
+    return {pair: tuple(total) for pair, total in totals.items()}
+
+
+def _parse_pair(text):
+    player, sep, computer = text.partition(':')
+    if not sep:
+        raise argparse.ArgumentTypeError("pairs are written PLAYER:COMPUTER")
+    return player, computer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate Rock Paper Scissors matches between strategies.")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_SHARD_SIZE * 10,
+                        help="rounds to play for each pair")
+    parser.add_argument('--pair', dest='pairs', action='append', type=_parse_pair,
+                        help=f"PLAYER:COMPUTER strategies to pit against each other, "
+                             f"from {', '.join(STRATEGIES)} (repeatable, default random:random)")
+    parser.add_argument('--variant', default='classic', type=parse_variant,
+                        help=f"game variant: {', '.join(VARIANTS)} or an odd number of moves")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help="rounds per shard; changing it changes the results for a seed")
+    args = parser.parse_args(argv)
+
+    pairs = args.pairs or [('random', 'random')]
+    start = time.perf_counter()
+    totals = simulate(pairs, args.rounds, args.variant, args.seed, args.workers, args.shard_size)
+    elapsed = time.perf_counter() - start
+
+    for (player, computer), (ties, wins, losses) in totals.items():
+        played = max(ties + wins + losses, 1)
+        print(f"{player} vs {computer}: {played:,} rounds - "
+              f"player {wins / played:.2%}, computer {losses / played:.2%}, ties {ties / played:.2%}")
+    total_rounds = args.rounds * len(pairs)
+    print(f"{total_rounds:,} rounds in {elapsed:.2f}s ({total_rounds / elapsed:,.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Snapshots of a game session, to resume it after a restart.
+
+A snapshot holds a GameEngine's score and last round and, when the computer
+is an NGramOpponent, everything it has learned: its counts table, history
+ring buffer and random generator state. The file is a few dozen bytes plus
+the raw counts table:
+
+    header   magic b'RPSSNP', format version, number of moves
+    score    player wins, computer wins, ties (uint64 each), and the last
+             round's player move, computer move and outcome (int8, -1 if none;
+             move codes fit since games have at most rules.MAX_MOVES moves)
+    opponent 0 for a stateless opponent, or 1 followed by the n-gram state
+
+All integers are little-endian. Restoring copies the arrays back in one go
+instead of replaying any rounds.
+
+Snapshotter keeps a snapshot file up to date as a session is played. A
+round only marks the session as changed; a background thread captures the
+engine's state under its lock and writes it, atomically, at most once per
+interval. So a round never waits for the copy or the disk, however large
+the opponent's tables, and a crash leaves the previous snapshot intact.
+"""
+import os
+import struct
+import sys
+import threading
+from array import array
+
+from engine import Round
+from opponent import NGramOpponent
+
+MAGIC = b'RPSSNP'
+VERSION = 1
+DEFAULT_INTERVAL = 1.0
+
+_HEADER = struct.Struct('<6sBB')
+_SCORE = struct.Struct('<QQQbbb')
+_NGRAM = struct.Struct('<IIIIQ')   # order, max_count, position, seen, context
+_RANDOM = struct.Struct('<B?d')    # state version, has gauss_next, gauss_next
+_RANDOM_WORDS = 625                # random.Random state: 624 words and an index
+_STATELESS = 0
+_NGRAM_KIND = 1
+
+
+def _little_endian(words):
+    if sys.byteorder == 'big':  # pragma: no cover - exercised only on big-endian hosts
+        words = array(words.typecode, words)
+        words.byteswap()
+    return words.tobytes()
+
+
+def _words(data, typecode='I'):
+    words = array(typecode)
+    words.frombytes(data)
+    if sys.byteorder == 'big':  # pragma: no cover - exercised only on big-endian hosts
+        words.byteswap()
+    return words
+
+
+def capture(engine):
+    """The snapshot of an engine's session, as bytes"""
+    last = engine.last_round or Round(-1, -1, -1)
+    parts = [_HEADER.pack(MAGIC, VERSION, engine.rules.size),
+             _SCORE.pack(engine.player_score, engine.computer_score, engine.ties, *last)]
+    opponent = engine.opponent
+    if isinstance(opponent, NGramOpponent):
+        version, state, gauss = opponent.random.getstate()
+        parts += [bytes((_NGRAM_KIND,)),
+                  _NGRAM.pack(opponent.order, opponent.max_count, opponent.position,
+                              opponent.seen, opponent.context),
+                  opponent.history.tobytes(),
+                  _little_endian(opponent.counts),
+                  _RANDOM.pack(version, gauss is not None, gauss or 0.0),
+                  _little_endian(array('I', state))]
+    else:
+        parts.append(bytes((_STATELESS,)))
+    return b''.join(parts)
+
+
+def restore(engine, data):
+    """Put the session of a snapshot back into an engine
+
+    An n-gram opponent in the snapshot replaces the engine's opponent;
+    otherwise the engine keeps its own. Observers are not notified.
+    Raises ValueError, leaving the engine as it was, if data is not a
+    complete snapshot of a game with the engine's rules.
+    """
+    try:
+        _restore(engine, data)
+    except (struct.error, IndexError) as error:
+        raise ValueError("truncated session snapshot") from error
+
+
+def _restore(engine, data):
+    # Every field is checked before anything is allocated or changed, so a
+    # damaged file can only ever raise ValueError
+    magic, version, moves = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a session snapshot")
+    if version != VERSION:
+        raise ValueError(f"unsupported session snapshot version {version}")
+    rules = engine.rules
+    if moves != rules.size:
+        raise ValueError(f"the snapshot is of a {moves}-move game, not {rules.size}")
+    offset = _HEADER.size
+    player_score, computer_score, ties, *last = _SCORE.unpack_from(data, offset)
+    offset += _SCORE.size
+    if last == [-1, -1, -1]:
+        last_round = None
+    elif (0 <= last[0] < moves and 0 <= last[1] < moves
+          and last[2] == rules.resolve(last[0], last[1])):
+        last_round = Round(*last)
+    else:
+        raise ValueError("corrupt last round in session snapshot")
+    kind = data[offset]
+    offset += 1
+    opponent = engine.opponent
+    if kind == _NGRAM_KIND:
+        opponent = _restore_ngram(rules, data, offset)
+    elif kind != _STATELESS:
+        raise ValueError(f"unknown opponent kind {kind} in session snapshot")
+    elif len(data) != offset:
+        raise ValueError("trailing data in session snapshot")
+    engine.opponent = opponent
+    engine.player_score = player_score
+    engine.computer_score = computer_score
+    engine.ties = ties
+    engine.last_round = last_round
+
+
+def _encode(history, position, size):
+    # An n-gram context: the ring buffer's moves as a base-size number, oldest first
+    context = 0
+    for i in range(len(history)):
+        context = context * size + history[(position + i) % len(history)]
+    return context
+
+
+def _restore_ngram(rules, data, offset):
+    order, max_count, position, seen, context = _NGRAM.unpack_from(data, offset)
+    offset += _NGRAM.size
+    if order < 1 or max_count < 1:
+        raise ValueError("corrupt n-gram opponent in session snapshot")
+    # The counts table has size ** (order + 1) words: stop as soon as it
+    # would not fit in the data, before building anything of that size
+    contexts = 1
+    for _ in range(order):
+        contexts *= rules.size
+        if contexts * rules.size * 4 > len(data):
+            raise ValueError("truncated session snapshot")
+    size = contexts * rules.size * 4
+    if len(data) != offset + order + size + _RANDOM.size + _RANDOM_WORDS * 4:
+        raise ValueError("truncated session snapshot")
+    history = array('B', data[offset:offset + order])
+    if not (position < order and seen <= order and max(history) < rules.size
+            and context == _encode(history, position, rules.size)):
+        raise ValueError("corrupt n-gram opponent in session snapshot")
+    offset += order
+    opponent = NGramOpponent(rules, order, max_count)
+    opponent.history = history
+    opponent.counts = _words(data[offset:offset + size])
+    offset += size
+    random_version, has_gauss, gauss = _RANDOM.unpack_from(data, offset)
+    offset += _RANDOM.size
+    state = tuple(_words(data[offset:]))
+    opponent.random.setstate((random_version, state, gauss if has_gauss else None))
+    opponent.position, opponent.seen, opponent.context = position, seen, context
+    return opponent
+
+
+def read(path):
+    """The snapshot bytes at path, or None if there is no snapshot yet"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write(path, data):
+    """Replace the snapshot at path atomically"""
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class Snapshotter:
+    """Snapshotter(engine, path, interval=DEFAULT_INTERVAL)
+
+    Keeps the snapshot at path up to date with engine from a background
+    thread, writing at most once per interval seconds and only after the
+    session has changed. close() writes the final state and stops.
+    """
+
+    def __init__(self, engine, path, interval=DEFAULT_INTERVAL):
+        self.engine = engine
+        self.path = path
+        self.interval = interval
+        self._dirty = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='snapshot', daemon=True)
+
+    def start(self):
+        self.engine.subscribe(self._changed)
+        self._thread.start()
+        return self
+
+    def _changed(self, engine):
+        # Engine observer, on the thread that plays: only flag the change
+        if not self._dirty:
+            with self._condition:
+                self._dirty = True
+                self._condition.notify()
+
+    def _capture(self):
+        with self.engine.lock:
+            return capture(self.engine)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._dirty or self._closed)
+                if self._closed:
+                    return
+                self._dirty = False
+            write(self.path, self._capture())
+            # Rounds played meanwhile pile up into a single later write
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed, timeout=self.interval)
+
+    def close(self):
+        """Stop the thread and write the engine's latest state, if it changed"""
+        if self._closed:
+            return
+        self.engine.unsubscribe(self._changed)
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self._dirty:
+            write(self.path, self._capture())
@@ -0,0 +1,147 @@
+"""
+Bot strategies that can stand in for the computer or play each other.
+
+Every strategy implements the opponent interface of opponent.NGramOpponent:
+choose() returns its move code for the next round and observe(move) records
+the other side's move once the round has been played. STRATEGIES maps each
+strategy's name to a factory building it for one (rules, seed, stream), so
+that simulate.py and tournament.py can play any pairing reproducibly.
+"""
+import random
+
+from movegen import MoveGenerator
+from opponent import NGramOpponent
+from rules import CLASSIC
+
+
+class FrequencyStrategy:
+    """FrequencyStrategy(rules=CLASSIC, seed=None)
+
+    Plays the counter of the move the other side has played most often,
+    and random moves until it has seen one.
+    """
+
+    def __init__(self, rules=CLASSIC, seed=None):
+        self.rules = rules
+        self.random = random.Random(seed)
+        self.counts = [0] * rules.size
+        self.favourite = None  # the most frequent move so far, earliest on ties
+
+    def choose(self):
+        if self.favourite is None:
+            return self.random.randrange(self.rules.size)
+        return self.rules.counter(self.favourite)
+
+    def observe(self, move):
+        self.counts[move] += 1
+        if self.favourite is None or self.counts[move] > self.counts[self.favourite]:
+            self.favourite = move
+
+
+class CycleDetector:
+    """CycleDetector(rules=CLASSIC, max_period=6, seed=None)
+
+    Looks for the other side repeating a cycle of up to max_period moves and
+    plays the counter of the cycle's next move, or a random move while no
+    cycle is apparent. A period counts once its last cycle repeated the one
+    before; the shortest such period wins. Each round costs O(max_period).
+    """
+
+    def __init__(self, rules=CLASSIC, max_period=6, seed=None):
+        if max_period < 1:
+            raise ValueError("max_period must be at least 1")
+        self.rules = rules
+        self.max_period = max_period
+        self.random = random.Random(seed)
+        self.history = [0] * max_period  # ring buffer of recent moves
+        self.position = 0  # next slot to overwrite, i.e. the oldest move
+        self.seen = 0  # moves observed so far, capped at max_period
+        # streaks[p]: how many of the latest moves equal the move p before them
+        self.streaks = [0] * (max_period + 1)
+
+    def _back(self, period):
+        return self.history[(self.position - period) % self.max_period]
+
+    def predict(self):
+        """The other side's next move code if it is in a cycle, else None"""
+        for period in range(1, self.max_period + 1):
+            if self.streaks[period] >= period:
+                return self._back(period)
+        return None
+
+    def choose(self):
+        predicted = self.predict()
+        if predicted is None:
+            return self.random.randrange(self.rules.size)
+        return self.rules.counter(predicted)
+
+    def observe(self, move):
+        streaks = self.streaks
+        for period in range(1, self.seen + 1):
+            streaks[period] = streaks[period] + 1 if self._back(period) == move else 0
+        self.history[self.position] = move
+        self.position = (self.position + 1) % self.max_period
+        self.seen = min(self.seen + 1, self.max_period)
+
+
+class WinStayLoseShift:
+    """WinStayLoseShift(rules=CLASSIC, seed=None)
+
+    Repeats its move after a win; after a tie or a loss it switches to the
+    counter of the move the other side just played. The first move is random.
+    """
+
+    def __init__(self, rules=CLASSIC, seed=None):
+        self.rules = rules
+        self.random = random.Random(seed)
+        self.move = None
+
+    def choose(self):
+        if self.move is None:
+            self.move = self.random.randrange(self.rules.size)
+        return self.move
+
+    def observe(self, move):
+        if self.move is None or self.rules.resolve(self.move, move) != 1:
+            self.move = self.rules.counter(move)
+
+
+def _random_strategy(rules, seed, stream):
+    return MoveGenerator(rules, seed=seed, stream=stream)
+
+
+def _adaptive_strategy(rules, seed, stream):
+    return NGramOpponent(rules, seed=f"{seed}/{stream}")
+
+
+def _frequency_strategy(rules, seed, stream):
+    return FrequencyStrategy(rules, seed=f"{seed}/{stream}")
+
+
+def _cycle_strategy(rules, seed, stream):
+    return CycleDetector(rules, seed=f"{seed}/{stream}")
+
+
+def _wsls_strategy(rules, seed, stream):
+    return WinStayLoseShift(rules, seed=f"{seed}/{stream}")
+
+
+# Each factory builds an opponent-interface object (choose/observe) for one
+# (rules, seed, stream)
+STRATEGIES = {
+    'random': _random_strategy,
+    'adaptive': _adaptive_strategy,
+    'frequency': _frequency_strategy,
+    'cycle': _cycle_strategy,
+    'wsls': _wsls_strategy,
+}
+
+# Bump a strategy's version whenever the way it plays changes: cached
+# tournament results are keyed by it (see tournament.py)
+VERSIONS = {
+    'random': 1,
+    'adaptive': 1,
+    'frequency': 1,
+    'cycle': 1,
+    'wsls': 1,
+}
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from analytics import COMPUTER, PLAYER, MatchStats
+from matchlog import MatchLogWriter
+from rules import CLASSIC, LIZARD_SPOCK
+
+
+def naive_stats(players, computers, rules):
+    """The statistics, one round at a time"""
+    size = rules.size
+    transitions = np.zeros((2, size, size), dtype=np.int64)
+    replies = np.zeros((2, size, size), dtype=np.int64)
+    responses = np.zeros((2, 3, size), dtype=np.int64)
+    outcomes = [rules.resolve(p, c) for p, c in zip(players, computers)]
+    for i in range(1, len(outcomes)):
+        moves = (players[i], computers[i])
+        previous = (players[i - 1], computers[i - 1])
+        results = (outcomes[i - 1], (0, 2, 1)[outcomes[i - 1]])
+        for side in (PLAYER, COMPUTER):
+            transitions[side, previous[side], moves[side]] += 1
+            replies[side, previous[1 - side], moves[side]] += 1
+            responses[side, results[side], (moves[side] - previous[side]) % size] += 1
+    runs = []
+    for outcome in outcomes:
+        if runs and runs[-1][0] == outcome:
+            runs[-1][1] += 1
+        else:
+            runs.append([outcome, 1])
+    streaks = np.zeros((3, max(length for _, length in runs) + 1), dtype=np.int64)
+    for outcome, length in runs:
+        streaks[outcome, length] += 1
+    return transitions, replies, responses, streaks
+
+
+class TestMatchStats(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.players = rng.integers(0, 3, 5_000, dtype=np.uint8)
+        # A sticky computer, so that streaks get long
+        self.computers = np.where(rng.random(5_000) < 0.7, 1, rng.integers(0, 3, 5_000)).astype(np.uint8)
+
+    def assert_matches_naive(self, stats, players, computers, rules=CLASSIC):
+        transitions, replies, responses, streaks = naive_stats(players.tolist(), computers.tolist(), rules)
+        np.testing.assert_array_equal(stats.transitions, transitions)
+        np.testing.assert_array_equal(stats.replies, replies)
+        np.testing.assert_array_equal(stats.responses, responses)
+        np.testing.assert_array_equal(stats.streak_lengths(), streaks)
+        self.assertEqual(stats.rounds, len(players))
+        self.assertEqual(sum(stats.tally), len(players))
+
+    def test_matches_round_by_round(self):
+        """Test every table against a plain loop over the rounds"""
+        stats = MatchStats()
+        stats.update(self.players, self.computers)
+        self.assert_matches_naive(stats, self.players, self.computers)
+        self.assertAlmostEqual(sum(stats.win_rates()), 1.0)
+
+    def test_incremental_updates(self):
+        """Test that any split into batches gives the same statistics"""
+        stats = MatchStats()
+        for start, stop in [(0, 1), (1, 2), (2, 700), (700, 700), (700, 4_999), (4_999, 5_000)]:
+            stats.update(self.players[start:stop], self.computers[start:stop])
+        self.assert_matches_naive(stats, self.players, self.computers)
+
+    def test_longest_streaks(self):
+        """Test streaks that continue across batches"""
+        stats = MatchStats()
+        stats.update([0, 0, 0], [2, 2, 0])  # win, win, tie
+        stats.update([0, 0, 1], [0, 0, 0])  # tie, tie, win
+        self.assertEqual(tuple(stats.longest_streaks()), (3, 2, 0))
+        stats.update([1] * 4, [0] * 4)
+        self.assertEqual(tuple(stats.longest_streaks()), (3, 5, 0))
+
+    def test_refresh_reads_only_new_rounds(self):
+        """Test following a growing match log"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'match.log')
+            players = self.players % LIZARD_SPOCK.size
+            computers = (self.computers + 3) % LIZARD_SPOCK.size
+            outcomes = [LIZARD_SPOCK.resolve(p, c) for p, c in zip(players, computers)]
+            stats = MatchStats(LIZARD_SPOCK)
+            with MatchLogWriter(path, LIZARD_SPOCK) as log:
+                for start in range(0, 5_000, 1_500):
+                    log.extend(players[start:start + 1_500], computers[start:start + 1_500],
+                               outcomes[start:start + 1_500])
+                    log.flush()
+                    stats.refresh(path)
+            self.assert_matches_naive(stats, players, computers, LIZARD_SPOCK)
+
+
+if __name__ == '__main__':
+    unittest.main()
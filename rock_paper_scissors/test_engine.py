@@ -0,0 +1,47 @@
+import unittest
+
+from engine import GameEngine, Round
+from movegen import MoveGenerator
+from rules import CLASSIC, LIZARD_SPOCK
+from script import OUTCOMES, determine_winner
+
+
+class TestGameEngine(unittest.TestCase):
+
+    def test_play_updates_score(self):
+        """Test that rounds are resolved and scored like determine_winner"""
+        engine = GameEngine(opponent=MoveGenerator(seed=4))
+        for player in [0, 1, 2] * 10:
+            result = engine.play(player)
+            self.assertIsInstance(result, Round)
+            expected = determine_winner(CLASSIC.moves[result.player], CLASSIC.moves[result.computer])
+            self.assertEqual(OUTCOMES[result.outcome], expected)
+        self.assertEqual(engine.rounds, 30)
+        self.assertEqual(engine.player_score + engine.computer_score + engine.ties, 30)
+
+    def test_observers_notified_once_per_batch(self):
+        """Test that play_many notifies once however many rounds it plays"""
+        engine = GameEngine(LIZARD_SPOCK)
+        calls = []
+        engine.subscribe(calls.append)
+        engine.play(3)
+        engine.play_many([0, 1, 2, 3, 4] * 100)
+        self.assertEqual(calls, [engine, engine])
+        self.assertEqual(engine.rounds, 501)
+
+    def test_reset(self):
+        """Test that reset clears the score and the last round"""
+        engine = GameEngine()
+        calls = []
+        engine.play_many([0, 1, 2])
+        engine.subscribe(calls.append)
+        engine.reset()
+        self.assertEqual((engine.rounds, engine.last_round), (0, None))
+        self.assertEqual(len(calls), 1)
+        engine.unsubscribe(calls.append)
+        engine.play(0)
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
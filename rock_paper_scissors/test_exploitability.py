@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from exploitability import (best_response, conditional_exploitability, evaluate_strategies,
+                            history_counts, nash_distance, payoff_matrix)
+from rules import CLASSIC, LIZARD_SPOCK, Rules
+
+
+class TestExploitability(unittest.TestCase):
+
+    def test_payoff_matrix(self):
+        """Test that the matrix follows the rules and is zero-sum"""
+        for rules in (CLASSIC, LIZARD_SPOCK, Rules.cyclic(9)):
+            payoffs = payoff_matrix(rules)
+            np.testing.assert_array_equal(payoffs, -payoffs.T)
+            for player in range(rules.size):
+                for computer in range(rules.size):
+                    expected = (0, 1, -1)[rules.resolve(player, computer)]
+                    self.assertEqual(payoffs[player, computer], expected)
+
+    def test_best_response(self):
+        """Test pure, mixed and equilibrium profiles in one batch"""
+        profiles = np.array([[1, 0, 0], [0, 3, 1], [1, 1, 1], [0, 0, 0]])
+        values, moves = best_response(profiles)
+        np.testing.assert_allclose(values, [1, 0.75, 0, 0])
+        self.assertEqual(moves[0], CLASSIC.counter(0))
+        self.assertEqual(moves[1], CLASSIC.counter(1))
+        np.testing.assert_allclose(nash_distance(profiles), [2 / 3, 5 / 12, 0, 0])
+
+    def test_batched_over_leading_dimensions(self):
+        """Test that many profiles give the same values as one at a time"""
+        profiles = np.random.default_rng(0).random((4, 50, LIZARD_SPOCK.size))
+        values, _ = best_response(profiles, LIZARD_SPOCK)
+        self.assertEqual(values.shape, (4, 50))
+        self.assertAlmostEqual(values[2, 7], best_response(profiles[2, 7], LIZARD_SPOCK)[0])
+        self.assertTrue((values >= 0).all())
+
+    def test_conditional_exploitability(self):
+        """Test that a balanced strategy is exploitable given its last move"""
+        moves = np.tile([0, 0, 1, 1, 2, 2], 100)
+        counts = history_counts(moves, np.zeros_like(moves), CLASSIC.size)
+        self.assertAlmostEqual(best_response(counts.sum(axis=0))[0], 0, places=2)
+        self.assertAlmostEqual(float(conditional_exploitability(counts)), 0.5, places=2)
+        np.testing.assert_allclose(conditional_exploitability(np.stack([counts, counts * 0])),
+                                   [conditional_exploitability(counts), 0])
+
+    def test_evaluate_strategies(self):
+        """Test that predictable strategies are found exploitable"""
+        results = evaluate_strategies(['random', 'wsls'], rounds=3_000)
+        self.assertLess(results['random'][1], 0.1)
+        self.assertAlmostEqual(results['wsls'][1], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
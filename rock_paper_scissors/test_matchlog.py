@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from matchlog import HEADER_SIZE, MatchLogReader, MatchLogWriter, pack_round, unpack_round
+from rules import CLASSIC, LIZARD_SPOCK, Rules
+
+
+class TestMatchLog(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'match.log')
+
+    def test_pack_round_trip(self):
+        """Test that every round of an 8-move game packs into one byte"""
+        for player in range(8):
+            for computer in range(8):
+                for outcome in range(3):
+                    byte = pack_round(player, computer, outcome)
+                    self.assertLess(byte, 256)
+                    self.assertEqual(unpack_round(byte), (player, computer, outcome))
+
+    def test_write_and_replay(self):
+        """Test single and bulk appends across writer sessions"""
+        with MatchLogWriter(self.path, LIZARD_SPOCK, buffer_size=4) as log:
+            log.append(4, 3, 1)
+            log.append(0, 1, 2)
+        players = np.array([1, 2, 3], dtype=np.uint8)
+        computers = np.array([1, 0, 4], dtype=np.uint8)
+        outcomes = np.array([0, 1, 2], dtype=np.uint8)
+        with MatchLogWriter(self.path, LIZARD_SPOCK) as log:
+            log.extend(players, computers, outcomes)
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 5)
+
+        with MatchLogReader(self.path) as reader:
+            self.assertEqual(reader.moves, 5)
+            self.assertEqual(len(reader), 5)
+            self.assertEqual(list(reader)[:2], [(4, 3, 1), (0, 1, 2)])
+            np.testing.assert_array_equal(reader.players[2:], players)
+            np.testing.assert_array_equal(reader.computers[2:], computers)
+            np.testing.assert_array_equal(reader.outcomes[2:], outcomes)
+
+    def test_reader_without_numpy(self):
+        """Test the memoryview fallback of the reader"""
+        with MatchLogWriter(self.path) as log:
+            log.append(2, 1, 1)
+        with patch('matchlog.np', None):
+            reader = MatchLogReader(self.path)
+            self.assertEqual(list(reader), [(2, 1, 1)])
+            reader.close()
+
+    def test_rejects_mismatched_logs(self):
+        """Test that variants and foreign files are checked"""
+        MatchLogWriter(self.path, CLASSIC).close()
+        with self.assertRaises(ValueError):
+            MatchLogWriter(self.path, LIZARD_SPOCK)
+        with self.assertRaises(ValueError):
+            MatchLogWriter(self.path + '2', Rules.cyclic(9))
+        with open(self.path + '3', 'wb') as f:
+            f.write(b'not a log')
+        with self.assertRaises(ValueError):
+            MatchLogReader(self.path + '3')
+
+    def test_empty_log(self):
+        """Test reading a log with no rounds yet"""
+        MatchLogWriter(self.path).close()
+        with MatchLogReader(self.path) as reader:
+            self.assertEqual(len(reader), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import types
+import unittest
+import urllib.request
+
+import metrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = metrics.Registry()
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Each bucket counts the observations up to its bound, +Inf all of them"""
+        histogram = self.registry.histogram('t_seconds', "Test", buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(seconds)
+        samples = dict(histogram.samples())
+        self.assertEqual(samples['t_seconds_bucket{le="0.1"}'], 2)
+        self.assertEqual(samples['t_seconds_bucket{le="1.0"}'], 3)
+        self.assertEqual(samples['t_seconds_bucket{le="+Inf"}'], 4)
+        self.assertEqual(samples['t_seconds_count'], 4)
+        self.assertAlmostEqual(samples['t_seconds_sum'], 2.65)
+
+    def test_render_describes_each_name_once(self):
+        """Counters with different labels share one HELP and TYPE line"""
+        self.registry.counter('rounds_total', "Rounds", {'result': 'tie'}).inc()
+        self.registry.counter('rounds_total', "Rounds", {'result': 'win'}).inc(2)
+        self.assertIs(self.registry.counter('rounds_total', "Rounds", {'result': 'tie'}),
+                      self.registry.counter('rounds_total', "Rounds", {'result': 'tie'}))
+        lines = self.registry.render().splitlines()
+        self.assertEqual(lines.count("# HELP rounds_total Rounds"), 1)
+        self.assertEqual(lines.count("# TYPE rounds_total counter"), 1)
+        self.assertIn('rounds_total{result="tie"} 1', lines)
+        self.assertIn('rounds_total{result="win"} 2', lines)
+
+    def test_instrument_times_and_passes_results(self):
+        """instrument wraps a function once, keeping its result and arguments"""
+        owner = types.SimpleNamespace(add=lambda a, b: a + b)
+        histogram = self.registry.histogram('add_seconds', "Test")
+        seen = []
+        metrics.instrument(owner, 'add', histogram, lambda result, *args: seen.append((result, args)))
+        wrapped = owner.add
+        metrics.instrument(owner, 'add', histogram)
+        self.assertIs(owner.add, wrapped)
+        self.assertEqual(owner.add(2, 3), 5)
+        self.assertEqual(histogram.count, 1)
+        self.assertEqual(seen, [(5, (2, 3))])
+
+    def test_serve(self):
+        """The metrics are served in the Prometheus text format"""
+        self.registry.counter('served_total', "Test").inc()
+        server = metrics.serve(0, registry=self.registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertEqual(response.headers['Content-Type'], metrics.CONTENT_TYPE)
+                self.assertIn("served_total 1", response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import patch
+
+from movegen import MoveGenerator
+from rules import CLASSIC, LIZARD_SPOCK
+
+
+class TestMoveGenerator(unittest.TestCase):
+
+    def test_reproducible_per_seed_and_stream(self):
+        """Test that a seed and stream always give the same moves"""
+        first = MoveGenerator(seed=7, stream=1).take(100).tolist()
+        again = MoveGenerator(seed=7, stream=1).take(100).tolist()
+        other = MoveGenerator(seed=7, stream=2).take(100).tolist()
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+
+    def test_take_and_next_share_the_stream(self):
+        """Test that mixing take() and next_move() does not change the sequence"""
+        expected = MoveGenerator(LIZARD_SPOCK, seed=3, block_size=10).take(35).tolist()
+        mixed = MoveGenerator(LIZARD_SPOCK, seed=3, block_size=10)
+        moves = [mixed.next_move() for _ in range(7)]
+        moves += mixed.take(20).tolist()
+        moves += [mixed.next_move() for _ in range(8)]
+        self.assertEqual(moves, expected)
+        self.assertTrue(all(0 <= move < LIZARD_SPOCK.size for move in moves))
+
+    def test_array_fallback_without_numpy(self):
+        """Test the array-backed buffer used when NumPy is missing"""
+        with patch('movegen.np', None):
+            generator = MoveGenerator(seed=5, block_size=4)
+            moves = generator.take(10)
+            self.assertEqual(moves.typecode, 'B')
+            self.assertEqual(len(moves), 10)
+            self.assertEqual(list(moves), MoveGenerator(seed=5, block_size=4).take(10).tolist())
+            self.assertIn(generator.choice(), CLASSIC.moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
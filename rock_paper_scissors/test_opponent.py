@@ -0,0 +1,47 @@
+import unittest
+
+from opponent import NGramOpponent
+from rules import CLASSIC, LIZARD_SPOCK
+
+
+class TestNGramOpponent(unittest.TestCase):
+
+    def test_exploits_repeating_pattern(self):
+        """Test that a predictable player is beaten once the pattern is learned"""
+        opponent = NGramOpponent(order=2, seed=0)
+        pattern = [0, 0, 1, 2]
+        outcomes = []
+        for i in range(400):
+            player = pattern[i % len(pattern)]
+            computer = opponent.choose()
+            opponent.observe(player)
+            outcomes.append(CLASSIC.resolve(player, computer))
+        self.assertEqual(outcomes[-100:].count(2), 100)
+
+    def test_memory_is_bounded(self):
+        """Test that counts saturate instead of growing without bound"""
+        opponent = NGramOpponent(LIZARD_SPOCK, order=1, max_count=100, seed=0)
+        size = len(opponent.counts)
+        for _ in range(1000):
+            opponent.choose()
+            opponent.observe(3)
+        self.assertEqual(len(opponent.counts), size)
+        self.assertLess(max(opponent.counts), 100)
+        self.assertEqual(opponent.predict(), 3)
+        self.assertEqual(opponent.choose(), LIZARD_SPOCK.counter(3))
+
+    def test_context_tracks_recent_moves(self):
+        """Test that the ring buffer context encodes the last `order` moves"""
+        opponent = NGramOpponent(order=3, seed=0)
+        for move in [2, 0, 1, 2, 1]:
+            opponent.observe(move)
+        self.assertEqual(opponent.context, 1 * 9 + 2 * 3 + 1)
+
+    def test_invalid_order(self):
+        """Test that a zero-length history is rejected"""
+        with self.assertRaises(ValueError):
+            NGramOpponent(order=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
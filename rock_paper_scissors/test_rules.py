@@ -0,0 +1,69 @@
+import argparse
+import unittest
+
+from rules import CLASSIC, LIZARD_SPOCK, MAX_MOVES, Rules, get_rules, parse_variant
+from script import OUTCOMES, determine_winner
+
+
+class TestRules(unittest.TestCase):
+
+    def test_classic_matches_determine_winner(self):
+        """Test the classic table against the string resolver"""
+        for player in CLASSIC.moves:
+            for computer in CLASSIC.moves:
+                outcome = CLASSIC.resolve(CLASSIC.codes[player], CLASSIC.codes[computer])
+                self.assertEqual(OUTCOMES[outcome], determine_winner(player, computer))
+
+    def test_lizard_spock(self):
+        """Test the rock-paper-scissors-lizard-spock relations"""
+        wins = {
+            'scissors': ('paper', 'lizard'),
+            'paper': ('rock', 'spock'),
+            'rock': ('lizard', 'scissors'),
+            'lizard': ('spock', 'paper'),
+            'spock': ('scissors', 'rock'),
+        }
+        for winner, losers in wins.items():
+            for loser in losers:
+                self.assertEqual(determine_winner(winner, loser, LIZARD_SPOCK), 'player_win')
+                self.assertEqual(determine_winner(loser, winner, LIZARD_SPOCK), 'computer_win')
+
+    def test_cyclic_is_balanced(self):
+        """Test that every move of an N-move game wins and loses equally often"""
+        rules = Rules.cyclic(9)
+        for player in range(rules.size):
+            outcomes = [rules.resolve(player, computer) for computer in range(rules.size)]
+            self.assertEqual(outcomes.count(0), 1)
+            self.assertEqual(outcomes.count(1), 4)
+            self.assertEqual(outcomes.count(2), 4)
+            self.assertEqual(rules.resolve(rules.counter(player), player), 1)
+
+    def test_invalid_rules(self):
+        """Test that even, tiny or oversized move sets are rejected"""
+        with self.assertRaises(ValueError):
+            Rules(('rock', 'paper'))
+        with self.assertRaises(ValueError):
+            Rules.cyclic(4)
+        with self.assertRaises(ValueError):
+            get_rules(str(MAX_MOVES + 2))
+        with self.assertRaises(ValueError):
+            get_rules('chess')
+
+    def test_get_rules(self):
+        """Test variant lookup by name and by move count"""
+        self.assertIs(get_rules('rpsls'), LIZARD_SPOCK)
+        self.assertEqual(get_rules('7').size, 7)
+        self.assertEqual(get_rules(str(MAX_MOVES)).size, MAX_MOVES)
+        self.assertEqual(CLASSIC.aliases['r'], CLASSIC.codes['rock'])
+
+    def test_parse_variant(self):
+        """Test the --variant converter keeps valid names and refuses the rest"""
+        self.assertEqual(parse_variant('rpsls'), 'rpsls')
+        self.assertEqual(parse_variant('9'), '9')
+        for text in ['chess', '4', str(MAX_MOVES + 2)]:
+            with self.subTest(text=text), self.assertRaises(argparse.ArgumentTypeError):
+                parse_variant(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
 import unittest
 from unittest.mock import patch
-from script import get_computer_choice, determine_winner, TIE, PLAYER_WIN, COMPUTER_WIN
+from movegen import MoveGenerator
+from rules import CLASSIC
+from script import get_computer_choice, determine_winner, parse_args, run_batch, _read_moves, TIE, PLAYER_WIN, COMPUTER_WIN
 
 class TestRockPaperScissors(unittest.TestCase):
     
@@ -55,5 +58,53 @@ class TestRockPaperScissors(unittest.TestCase):
         self.assertEqual(result, 'paper')
         mock_choice.assert_called_once_with(['rock', 'paper', 'scissors'])
 
+class TestBatchMode(unittest.TestCase):
+
+    def run_batch(self, text, **kwargs):
+        out, err = io.StringIO(), io.StringIO()
+        counts = run_batch(io.StringIO(text), out, opponent=MoveGenerator(seed=0), err=err, **kwargs)
+        return counts, out.getvalue().splitlines(), err.getvalue()
+
+    def test_results_match_determine_winner(self):
+        """Test that every batch result line agrees with determine_winner"""
+        counts, lines, _ = self.run_batch("r p s\nrock PAPER scissors\n", chunk_size=4)
+        rounds = [line.split('\t') for line in lines[:-2]]
+        self.assertEqual(len(rounds), 6)
+        for player, computer, result in rounds:
+            self.assertEqual(determine_winner(player, computer), result)
+        self.assertEqual(sum(counts), 6)
+        self.assertEqual(lines[-1], f"Score - You: {counts[1]}, Computer: {counts[2]}")
+
+    def test_invalid_moves_and_quit(self):
+        """Test that invalid moves are reported and quit stops the batch"""
+        counts, lines, err = self.run_batch("r\nbanana\np quit s\n", summary_only=True)
+        self.assertEqual(sum(counts), 2)
+        self.assertEqual(lines[0], "Rounds: 2, Ties: %d, Invalid: 1" % counts[0])
+        self.assertEqual(err, "line 2: invalid choice 'banana'\n")
+
+    def test_same_results_for_any_chunk_size(self):
+        """Test that chunking does not change the outcome"""
+        moves = "r p s s p r\n" * 50
+        self.assertEqual(self.run_batch(moves, chunk_size=7)[1], self.run_batch(moves)[1])
+
+    def test_log_needs_a_loggable_variant(self):
+        """Test that --log with too many moves for a match log is a usage error"""
+        self.assertEqual(parse_args(['--variant', '7', '--log', 'x.log']).log, 'x.log')
+        with patch('sys.stderr', io.StringIO()) as err, self.assertRaises(SystemExit):
+            parse_args(['--variant', '9', '--log', 'x.log'])
+        self.assertIn("--log supports variants of at most 8 moves", err.getvalue())
+
+    def test_tokens_split_across_read_blocks(self):
+        """Test that reading in small blocks gives the same moves and error lines"""
+        text = "rock  paper\nscissors banana\n\n r\tkiwi  \nPaper"
+        for block_size in (1, 2, 3, 5, 8, 64):
+            with self.subTest(block_size=block_size):
+                invalid, err = [0], io.StringIO()
+                moves = list(_read_moves(io.StringIO(text), CLASSIC.aliases, invalid, err, block_size))
+                self.assertEqual(moves, [0, 1, 2, 0, 1])
+                self.assertEqual(invalid, [2])
+                self.assertEqual(err.getvalue(), "line 2: invalid choice 'banana'\n"
+                                                 "line 4: invalid choice 'kiwi'\n")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,67 @@
+import asyncio
+import re
+import unittest
+
+from movegen import MoveGenerator
+from server import GameServer
+
+SCORE = re.compile(r"Score - You: (\d+), Computer: (\d+)")
+
+
+async def play(port, prompt, moves):
+    """Loopback client: play the moves, then quit, returning each round's reply"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await reader.readuntil(prompt)
+    replies = []
+    for move in moves:
+        writer.write(f"{move}\n".encode())
+        replies.append((await reader.readuntil(prompt))[:-len(prompt)].decode())
+    writer.write(b"quit\n")
+    farewell = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return replies, farewell.decode()
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.game = GameServer(generator=MoveGenerator(seed=0))
+        self.server = await self.game.start(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.prompt = self.game.prompt
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_protocol_matches_cli(self):
+        """Test the replies for valid, invalid and quit inputs"""
+        replies, farewell = await play(self.port, self.prompt, ['r', 'banana', 'PAPER'])
+        self.assertRegex(replies[0], r"^Computer chose: (rock|paper|scissors)\n")
+        self.assertEqual(replies[1], "Invalid choice. Please try again.\n")
+        self.assertIn("-" * 20, replies[2])
+        self.assertEqual(farewell, "Thanks for playing!\n")
+
+    async def test_overlong_line_is_invalid(self):
+        """Test that a line over the stream limit is refused and the session goes on"""
+        with self.assertNoLogs('asyncio'):
+            replies, farewell = await play(self.port, self.prompt, ['r' * 200_000, 'r'])
+        self.assertEqual(replies[0], "Invalid choice. Please try again.\n")
+        self.assertRegex(replies[1], r"^Computer chose: ")
+        self.assertEqual(farewell, "Thanks for playing!\n")
+
+    async def test_client_swarm_keeps_separate_scores(self):
+        """Test that concurrent sessions each keep their own score"""
+        moves = ['r', 'p', 's'] * 5
+        results = await asyncio.gather(*(play(self.port, self.prompt, moves) for _ in range(200)))
+        for replies, farewell in results:
+            wins = sum("You win!" in reply for reply in replies)
+            losses = sum("Computer wins!" in reply for reply in replies)
+            self.assertEqual(SCORE.search(replies[-1]).groups(), (str(wins), str(losses)))
+            self.assertEqual(farewell, "Thanks for playing!\n")
+        self.assertEqual(len(self.game.store), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
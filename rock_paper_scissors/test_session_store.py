@@ -0,0 +1,59 @@
+import unittest
+
+from rules import MAX_MOVES
+from session_store import NO_MOVE, SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def test_record_rounds(self):
+        """Test that rounds update scores, counts and last moves"""
+        store = SessionStore()
+        session = store.open()
+        self.assertEqual(session.last_player_move, NO_MOVE)
+        session.record(0, 2, 1)
+        session.record(1, 2, 2)
+        session.record(2, 2, 0)
+        self.assertEqual((session.player_score, session.computer_score, session.rounds), (1, 1, 3))
+        self.assertEqual((session.last_player_move, session.last_computer_move), (2, 2))
+
+    def test_largest_move_codes(self):
+        """Test that every move code of the largest game is kept"""
+        session = SessionStore().open()
+        session.record(MAX_MOVES - 1, MAX_MOVES - 2, 2)
+        self.assertEqual((session.last_player_move, session.last_computer_move),
+                         (MAX_MOVES - 1, MAX_MOVES - 2))
+
+    def test_sessions_are_independent(self):
+        """Test that each session keeps its own row"""
+        store = SessionStore()
+        first, second = store.open(), store.open()
+        first.record(0, 2, 1)
+        self.assertEqual(second.player_score, 0)
+        self.assertEqual(store.get(first.id).player_score, 1)
+        self.assertEqual(len(store), 2)
+
+    def test_closed_slots_are_reused_and_reset(self):
+        """Test that a new session takes over a closed slot with fresh state"""
+        store = SessionStore()
+        sessions = [store.open() for _ in range(3)]
+        sessions[1].record(1, 0, 1)
+        sessions[1].close()
+        self.assertEqual(len(store), 2)
+        with self.assertRaises(KeyError):
+            store.get(sessions[1].id)
+        reused = store.open()
+        self.assertEqual(reused.id, sessions[1].id)
+        self.assertEqual((reused.player_score, reused.rounds), (0, 0))
+        self.assertEqual(len(store.active), 3)
+
+    def test_compact_footprint(self):
+        """Test that a session costs well under 100 bytes"""
+        store = SessionStore()
+        for _ in range(10_000):
+            store.open()
+        self.assertLess(store.nbytes / len(store), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
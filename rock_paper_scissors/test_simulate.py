@@ -0,0 +1,35 @@
+import unittest
+
+from simulate import simulate
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_totals_independent_of_worker_count(self):
+        """Test that a seed gives the same totals for any number of workers"""
+        pairs = [('random', 'random'), ('random', 'adaptive')]
+        single = simulate(pairs, 5_000, seed=11, workers=1, shard_size=1_000)
+        pooled = simulate(pairs, 5_000, seed=11, workers=2, shard_size=1_000)
+        self.assertEqual(single, pooled)
+        for counts in single.values():
+            self.assertEqual(sum(counts), 5_000)
+
+    def test_seed_changes_results(self):
+        """Test that different seeds give different matches"""
+        pairs = [('random', 'random')]
+        self.assertNotEqual(simulate(pairs, 3_000, seed=1, workers=1),
+                            simulate(pairs, 3_000, seed=2, workers=1))
+
+    def test_partial_shard_and_variant(self):
+        """Test a partial final shard and the N-move rules"""
+        totals = simulate([('adaptive', 'random')], 2_500, variant='rpsls', workers=1, shard_size=1_000)
+        self.assertEqual(sum(totals['adaptive', 'random']), 2_500)
+
+    def test_unknown_strategy(self):
+        """Test that unknown strategies are rejected up front"""
+        with self.assertRaises(ValueError):
+            simulate([('random', 'psychic')], 10, workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import script
+import snapshot
+from engine import GameEngine
+from movegen import MoveGenerator
+from opponent import NGramOpponent
+from rules import CLASSIC, LIZARD_SPOCK
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'session.snap')
+
+    def test_resume_adaptive_opponent(self):
+        """Test that a restored session plays on exactly like the original"""
+        moves = [i * i % 5 for i in range(500)]
+        original = GameEngine(LIZARD_SPOCK, NGramOpponent(LIZARD_SPOCK, order=3, seed=4))
+        original.play_many(moves[:300])
+        resumed = GameEngine(LIZARD_SPOCK)
+        snapshot.restore(resumed, snapshot.capture(original))
+        self.assertEqual((resumed.player_score, resumed.computer_score, resumed.ties),
+                         (original.player_score, original.computer_score, original.ties))
+        self.assertEqual(resumed.last_round, original.last_round)
+        self.assertEqual(resumed.opponent.counts, original.opponent.counts)
+        self.assertEqual([resumed.play(m) for m in moves[300:]], [original.play(m) for m in moves[300:]])
+
+    def test_stateless_opponent_is_kept(self):
+        """Test a fresh session with a random opponent"""
+        opponent = MoveGenerator(seed=1)
+        engine = GameEngine(opponent=opponent)
+        snapshot.restore(engine, snapshot.capture(GameEngine()))
+        self.assertIs(engine.opponent, opponent)
+        self.assertIsNone(engine.last_round)
+        self.assertEqual(engine.rounds, 0)
+
+    def test_rejects_other_games(self):
+        """Test that foreign files and other variants are refused"""
+        data = snapshot.capture(GameEngine())
+        with self.assertRaises(ValueError):
+            snapshot.restore(GameEngine(LIZARD_SPOCK), data)
+        with self.assertRaises(ValueError):
+            snapshot.restore(GameEngine(), b'RPSLOG' + data[6:])
+
+    def test_rejects_truncated_snapshots(self):
+        """Test that a cut-off file is refused and leaves the engine untouched"""
+        original = GameEngine(CLASSIC, NGramOpponent(seed=0))
+        original.play_many([0, 1, 2])
+        data = snapshot.capture(original)
+        engine = GameEngine()
+        opponent = engine.opponent
+        for length in (0, 10, 40, len(data) // 2, len(data) - 1):
+            with self.subTest(length=length), self.assertRaises(ValueError):
+                snapshot.restore(engine, data[:length])
+        self.assertIs(engine.opponent, opponent)
+        self.assertEqual(engine.rounds, 0)
+
+    def test_rejects_corrupt_fields(self):
+        """Test that damaged fields are refused before anything is built"""
+        original = GameEngine(CLASSIC, NGramOpponent(seed=0))
+        original.play_many([0, 1, 2, 2])
+        data = snapshot.capture(original)
+
+        def corrupt(layout, offset, field, value):
+            fields = list(layout.unpack_from(data, offset))
+            fields[field] = value
+            return data[:offset] + layout.pack(*fields) + data[offset + layout.size:]
+
+        score = snapshot._HEADER.size
+        ngram = score + snapshot._SCORE.size + 1
+        cases = [corrupt(snapshot._SCORE, score, 3, 50),  # last player move
+                 corrupt(snapshot._SCORE, score, 5, (original.last_round.outcome + 1) % 3),
+                 corrupt(snapshot._NGRAM, ngram, 0, 60),  # order
+                 corrupt(snapshot._NGRAM, ngram, 0, 2**32 - 1),
+                 corrupt(snapshot._NGRAM, ngram, 0, 0),
+                 corrupt(snapshot._NGRAM, ngram, 2, 2),  # position
+                 corrupt(snapshot._NGRAM, ngram, 4, 9)]  # context
+        for i, damaged in enumerate(cases):
+            engine = GameEngine()
+            with self.subTest(case=i), self.assertRaises(ValueError):
+                snapshot.restore(engine, damaged)
+            self.assertEqual(engine.rounds, 0)
+
+    def test_resume_other_variant_exits_cleanly(self):
+        """Test that the CLI reports a snapshot it cannot resume without a traceback"""
+        snapshot.write(self.path, snapshot.capture(GameEngine(LIZARD_SPOCK)))
+        with self.assertRaises(SystemExit) as raised:
+            script.play_session(CLASSIC, None, snapshot_path=self.path)
+        self.assertIn("5-move game", str(raised.exception.code))
+
+    def test_snapshotter(self):
+        """Test that the file follows the session and close saves its end"""
+        engine = GameEngine(CLASSIC, NGramOpponent(seed=0))
+        self.assertIsNone(snapshot.read(self.path))
+        snapshotter = snapshot.Snapshotter(engine, self.path, interval=60).start()
+        engine.play(0)
+        for _ in range(200):
+            if snapshot.read(self.path):
+                break
+            snapshotter._thread.join(0.01)
+        self.assertEqual(snapshot.read(self.path), snapshot.capture(engine))
+        engine.play_many([1, 2, 1])  # held back by the interval until close
+        snapshotter.close()
+        self.assertEqual(snapshot.read(self.path), snapshot.capture(engine))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_rounds_do_not_capture(self):
+        """Test that playing only flags the change and the thread copies the state"""
+        engine = GameEngine(CLASSIC, NGramOpponent(order=4, seed=0))
+        with mock.patch('snapshot.capture', wraps=snapshot.capture) as capture:
+            snapshotter = snapshot.Snapshotter(engine, self.path, interval=60).start()
+            for move in range(1000):
+                engine.play(move % 3)
+            snapshotter.close()
+        self.assertLessEqual(capture.call_count, 2)
+        self.assertEqual(snapshot.read(self.path), snapshot.capture(engine))
+
+
+if __name__ == '__main__':
+    unittest.main()
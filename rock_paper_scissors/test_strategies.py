@@ -0,0 +1,56 @@
+import unittest
+
+from rules import CLASSIC, LIZARD_SPOCK
+from strategies import STRATEGIES, VERSIONS, CycleDetector, FrequencyStrategy, WinStayLoseShift
+
+
+def play(strategy, moves, rules=CLASSIC):
+    """Feed the other side's moves to strategy; return its outcome code per round"""
+    outcomes = []
+    for move in moves:
+        outcomes.append(rules.resolve(strategy.choose(), move))
+        strategy.observe(move)
+    return outcomes
+
+
+class TestStrategies(unittest.TestCase):
+
+    def test_frequency_counters_favourite(self):
+        """Test that the most frequent move is countered"""
+        strategy = FrequencyStrategy(seed=0)
+        play(strategy, [0, 2, 2, 1])
+        self.assertEqual(strategy.choose(), CLASSIC.counter(2))
+
+    def test_cycle_detector_beats_cycles(self):
+        """Test that a repeated cycle is beaten from its second repetition"""
+        for period in range(1, LIZARD_SPOCK.size + 1):
+            pattern = [3 * i % LIZARD_SPOCK.size for i in range(period)]
+            strategy = CycleDetector(LIZARD_SPOCK, seed=0)
+            outcomes = play(strategy, pattern * 10, LIZARD_SPOCK)
+            self.assertEqual(outcomes[2 * period:], [1] * (8 * period), period)
+
+    def test_cycle_detector_without_cycle(self):
+        """Test that no prediction is made before a cycle has repeated"""
+        strategy = CycleDetector(seed=0)
+        play(strategy, [0, 1, 2, 2, 0])
+        self.assertIsNone(strategy.predict())
+
+    def test_win_stay_lose_shift(self):
+        """Test that a winning move is repeated and a losing one replaced"""
+        strategy = WinStayLoseShift(seed=0)
+        first = strategy.choose()
+        strategy.observe((first - 1) % 3)  # first beats it
+        self.assertEqual(strategy.choose(), first)
+        strategy.observe(CLASSIC.counter(first))  # beaten
+        self.assertEqual(strategy.choose(), CLASSIC.counter(CLASSIC.counter(first)))
+
+    def test_registry(self):
+        """Test that every strategy is reproducible for a seed and versioned"""
+        self.assertEqual(set(STRATEGIES), set(VERSIONS))
+        moves = [i * 7 % 3 for i in range(200)]
+        for name, factory in STRATEGIES.items():
+            self.assertEqual(play(factory(CLASSIC, 5, 1), moves), play(factory(CLASSIC, 5, 1), moves), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import tournament
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = os.path.join(directory.name, 'cache.json')
+
+    def test_round_robin(self):
+        """Test that every pair plays once and standings add up"""
+        results, played = tournament.tournament(['random', 'cycle', 'wsls'], 1_000,
+                                                workers=1, shard_size=500, cache_path=None)
+        self.assertEqual(list(results), [('random', 'cycle'), ('random', 'wsls'), ('cycle', 'wsls')])
+        self.assertEqual(played, 3)
+        for counts in results.values():
+            self.assertEqual(sum(counts), 1_000)
+        rows = tournament.standings(results)
+        self.assertEqual(sum(wins - losses for _, wins, losses, _ in rows), 0)
+        self.assertEqual([w - l for _, w, l, _ in rows], sorted((w - l for _, w, l, _ in rows), reverse=True))
+
+    def test_cache_plays_only_new_pairings(self):
+        """Test that adding a strategy or bumping a version replays only its pairings"""
+        first, played = tournament.tournament(['random', 'frequency'], 1_000, workers=1,
+                                              cache_path=self.cache)
+        self.assertEqual(played, 1)
+        again, played = tournament.tournament(['random', 'frequency', 'cycle'], 1_000, workers=1,
+                                              cache_path=self.cache)
+        self.assertEqual(played, 2)
+        self.assertEqual(again['random', 'frequency'], first['random', 'frequency'])
+        with mock.patch.dict(tournament.VERSIONS, cycle=2):
+            _, played = tournament.tournament(['random', 'frequency', 'cycle'], 1_000, workers=1,
+                                              cache_path=self.cache)
+        self.assertEqual(played, 2)
+        _, played = tournament.tournament(['random', 'frequency'], 1_000, seed=1, workers=1,
+                                          cache_path=self.cache)
+        self.assertEqual(played, 1)
+
+    def test_entry_order_shares_the_cache(self):
+        """Test that entering the strategies in another order reuses the results"""
+        first, played = tournament.tournament(['wsls', 'cycle', 'random'], 1_000, workers=1,
+                                              cache_path=self.cache)
+        self.assertEqual(played, 3)
+        again, played = tournament.tournament(['random', 'cycle', 'wsls'], 1_000, workers=1,
+                                              cache_path=self.cache)
+        self.assertEqual(played, 0)
+        for (player, computer), (ties, wins, losses) in again.items():
+            self.assertEqual(first[computer, player], (ties, losses, wins))
+        self.assertEqual(tournament.standings(first), tournament.standings(again))
+
+    def test_unknown_strategy(self):
+        """Test that unknown strategies are rejected up front"""
+        with self.assertRaises(ValueError):
+            tournament.tournament(['random', 'psychic'], 10, cache_path=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from script import MOVES, OUTCOMES, determine_winner
+from vectorized import Tally, encode_moves, resolve_rounds
+
+
+class TestResolveRounds(unittest.TestCase):
+
+    def test_matches_scalar_for_every_pair(self):
+        """Test every move pair against determine_winner"""
+        pairs = [(p, c) for p in MOVES for c in MOVES]
+        outcomes, _ = resolve_rounds(encode_moves(p for p, _ in pairs),
+                                     encode_moves(c for _, c in pairs))
+        for (player, computer), outcome in zip(pairs, outcomes):
+            self.assertEqual(OUTCOMES[outcome], determine_winner(player, computer))
+
+    def test_tally_counts(self):
+        """Test that the tally agrees with the outcome array"""
+        rng = np.random.default_rng(1)
+        player = rng.integers(0, 3, 10_000, dtype=np.uint8)
+        computer = rng.integers(0, 3, 10_000, dtype=np.uint8)
+        outcomes, tally = resolve_rounds(player, computer)
+        self.assertEqual(sum(tally), 10_000)
+        self.assertEqual(tally, Tally(*np.bincount(outcomes, minlength=3)))
+
+    def test_shape_mismatch(self):
+        """Test that mismatched inputs are rejected"""
+        with self.assertRaises(ValueError):
+            resolve_rounds([0, 1], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Round-robin tournament between bot strategies, with cached pairing results.
+
+Every pair of strategies plays one match through simulate.simulate, so the
+pairings' shards run in parallel on all cores. A pairing's result only
+depends on the two strategies' versions, the variant, seed, rounds and shard
+size (and on whether NumPy draws the random moves), so results are cached
+on disk under those: re-running a tournament after adding a strategy, or
+after bumping one strategy's version, only plays the pairings involved.
+Each pairing is played and cached with its strategies in name order, so the
+order they are entered in does not matter.
+
+Usage:
+    python tournament.py --rounds 1000000
+    python tournament.py --strategy random --strategy cycle --strategy wsls
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None
+
+from rules import VARIANTS, parse_variant
+from simulate import DEFAULT_SHARD_SIZE, simulate
+from strategies import STRATEGIES, VERSIONS
+
+DEFAULT_CACHE = 'tournament-cache.json'
+
+
+def pairing_key(player, computer, rounds, variant='classic', seed=0, shard_size=DEFAULT_SHARD_SIZE):
+    """The cache key of one pairing's result"""
+    backend = 'numpy' if np is not None else 'random'
+    return (f"{player}@{VERSIONS[player]}:{computer}@{VERSIONS[computer]}"
+            f"/{variant}/seed={seed}/rounds={rounds}/shard={shard_size}/{backend}")
+
+
+def load_cache(path):
+    """Cached results by pairing key; empty if path does not exist yet"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_cache(path, cache):
+    """Write the cache atomically, so an interrupted run never corrupts it"""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as f:
+        json.dump(cache, f, indent=0, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def tournament(names, rounds, variant='classic', seed=0, workers=None,
+               shard_size=DEFAULT_SHARD_SIZE, cache_path=DEFAULT_CACHE):
+    """Play every pair of the named strategies once
+
+    Returns a dict mapping each (player, computer) pair to its (ties, wins,
+    losses), and the number of pairings that were actually played rather
+    than read from the cache. cache_path=None disables the cache.
+    """
+    for name in names:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {name}")
+    pairs = list(itertools.combinations(dict.fromkeys(names), 2))
+    ordered = {pair: tuple(sorted(pair)) for pair in pairs}
+    keys = {pair: pairing_key(*pair, rounds, variant, seed, shard_size) for pair in ordered.values()}
+    cache = load_cache(cache_path) if cache_path else {}
+    missing = [pair for pair in keys if keys[pair] not in cache]
+    if missing:
+        played = simulate(missing, rounds, variant, seed, workers, shard_size)
+        for pair, counts in played.items():
+            cache[keys[pair]] = list(counts)
+        if cache_path:
+            save_cache(cache_path, cache)
+    results = {}
+    for pair in pairs:
+        ties, wins, losses = cache[keys[ordered[pair]]]
+        # Wins and losses are the first strategy's, in name order
+        results[pair] = (ties, wins, losses) if pair == ordered[pair] else (ties, losses, wins)
+    return results, len(missing)
+
+
+def standings(results):
+    """(name, wins, losses, ties) per strategy, by net wins, best first"""
+    table = {}
+    for (player, computer), (ties, wins, losses) in results.items():
+        for name, won, lost in ((player, wins, losses), (computer, losses, wins)):
+            row = table.setdefault(name, [0, 0, 0])
+            row[0] += won
+            row[1] += lost
+            row[2] += ties
+    return sorted(((name, *row) for name, row in table.items()),
+                  key=lambda row: row[1] - row[2], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a round-robin tournament between strategies.")
+    parser.add_argument('--strategy', dest='names', action='append', choices=STRATEGIES,
+                        help="a strategy to enter (repeatable, default: all)")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_SHARD_SIZE,
+                        help="rounds per pairing")
+    parser.add_argument('--variant', default='classic', type=parse_variant,
+                        help=f"game variant: {', '.join(VARIANTS)} or an odd number of moves")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per core)")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help="rounds per shard; changing it changes the results for a seed")
+    parser.add_argument('--cache', default=DEFAULT_CACHE,
+                        help=f"file of cached pairing results (default: {DEFAULT_CACHE})")
+    parser.add_argument('--no-cache', action='store_true', help="play every pairing")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results, played = tournament(args.names or list(STRATEGIES), args.rounds, args.variant,
+                                 args.seed, args.workers, args.shard_size,
+                                 None if args.no_cache else args.cache)
+    elapsed = time.perf_counter() - start
+
+    for (player, computer), (ties, wins, losses) in results.items():
+        print(f"{player} vs {computer}: {wins:,} - {losses:,} ({ties:,} ties)")
+    print()
+    for rank, (name, wins, losses, ties) in enumerate(standings(results), 1):
+        print(f"{rank}. {name:<10} net {wins - losses:+,} (won {wins:,}, lost {losses:,}, tied {ties:,})")
+    print(f"{played} of {len(results)} pairings played in {elapsed:.2f}s, the rest from the cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Vectorized round resolution for simulations.
+
+Moves are integer-encoded as indices into Rules.moves and outcomes as
+indices into script.OUTCOMES, so a whole batch of rounds is resolved with a
+single gather from the rules' outcome table instead of one determine_winner
+call per round.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from rules import CLASSIC
+
+Tally = namedtuple('Tally', ['ties', 'player_wins', 'computer_wins'])
+
+
+def encode_moves(moves, rules=CLASSIC):
+    """Convert an iterable of move names into a uint8 code array"""
+    return np.fromiter((rules.codes[move] for move in moves), dtype=np.uint8)
+
+
+def resolve_rounds(player, computer, rules=CLASSIC):
+    """Resolve many rounds at once.
+
+    player and computer are equal-length integer arrays of move codes.
+    Returns (outcomes, tally) where outcomes is a uint8 array of outcome
+    codes and tally holds the aggregate counts.
+    """
+    player = np.asarray(player)
+    computer = np.asarray(computer)
+    if player.shape != computer.shape:
+        raise ValueError("player and computer must have the same shape")
+    # Widen before combining so player * size + computer cannot overflow.
+    index = np.multiply(player, rules.size, dtype=np.intp)
+    index += computer
+    outcomes = np.frombuffer(rules.table, dtype=np.uint8).take(index)
+    counts = np.bincount(outcomes.ravel(), minlength=3)
+    return outcomes, Tally(*(int(n) for n in counts))